@@ -1 +1,5 @@
 """Grocery agent: recipe ingest, pantry, jumbo.cl cart."""
+from dotenv import load_dotenv
+
+# Read .env once, when the package is first imported, for the web app and the jumbo bot alike
+load_dotenv()
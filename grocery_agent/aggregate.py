@@ -2,6 +2,10 @@
 Aggregate recipe ingredients into a normalized, flattened grocery list.
 Used by the web checklist and by get_grocery_list() for the jumbo agent interface.
 """
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, NamedTuple
+
 from grocery_agent.ingredient_normalizer import (
     normalize_name_for_display,
     normalize_name_for_key,
@@ -10,20 +14,42 @@ from grocery_agent.ingredient_normalizer import (
 from grocery_agent.models import Recipe
 
 
+class FlatIngredient(NamedTuple):
+    """One recipe ingredient with portions applied (input row for merge and LLM normalization)."""
+    name: str
+    unit: str
+    form: str
+    total: float | None
+    pantry_item: bool
+    optional: bool
+    category: str
+
+
+@dataclass(slots=True)
+class _MergedLine:
+    """Running merge state for one (name_key, form) grocery line."""
+    amounts_by_norm: dict[str, list] = field(default_factory=dict)  # unit_norm -> [total, unit]
+    pantry_item: bool = True  # all merged rows are pantry items
+    optional: bool = False  # any merged row is optional
+    category: str | None = None  # first row's category
+
+
 def _format_amount(total_quantity: float | None, unit: str | None) -> str:
     """Format total quantity + unit for display (e.g. '3 cups', 'to taste')."""
     if total_quantity is None:
         return (unit or "to taste").strip()
-    if total_quantity == int(total_quantity):
-        num_str = str(int(total_quantity))
+    int_quantity = int(total_quantity)
+    if int_quantity == total_quantity:
+        num_str = str(int_quantity)
     else:
-        num_str = f"{total_quantity:.2g}".rstrip("0").rstrip(".")
-    return f"{num_str} {unit or ''}".strip()
+        num_str = format(total_quantity, ".2g").rstrip("0").rstrip(".")
+    if not unit:
+        return num_str
+    return f"{num_str} {unit}".rstrip()
 
 
-def flat_ingredients(recipes: list[Recipe]) -> list[dict]:
-    """Build a flat list of ingredient rows (one per recipe ingredient) with portions applied."""
-    flat = []
+def iter_flat_ingredients(recipes: list[Recipe]) -> Iterator[FlatIngredient]:
+    """Yield one ingredient row per recipe ingredient with portions applied (same order as flat_ingredients)."""
     for recipe in recipes:
         portions = recipe.portions or 4
         if portions <= 0:
@@ -31,21 +57,24 @@ def flat_ingredients(recipes: list[Recipe]) -> list[dict]:
         for ing in recipe.ingredients:
             qpp = ing.quantity_per_portion
             total = (qpp * portions) if qpp is not None else None
-            form_val = getattr(ing.form, "value", str(ing.form))
-            flat.append({
-                "name": (ing.name or "").strip(),
-                "unit": (ing.unit or "").strip() or "",
-                "form": form_val if isinstance(form_val, str) else getattr(form_val, "value", "fresh"),
-                "total": total,
-                "pantry_item": getattr(ing, "pantry_item", False),
-                "optional": getattr(ing, "optional", False),
-                "category": ing.category.value,
-            })
-    return flat
+            yield FlatIngredient(
+                name=(ing.name or "").strip(),
+                unit=(ing.unit or "").strip() or "",
+                form=ing.form.value,
+                total=total,
+                pantry_item=ing.pantry_item,
+                optional=ing.optional,
+                category=ing.category.value,
+            )
+
+
+def flat_ingredients(recipes: list[Recipe]) -> list[FlatIngredient]:
+    """Build a flat list of ingredient rows (one per recipe ingredient) with portions applied."""
+    return list(iter_flat_ingredients(recipes))
 
 
 def merge_flat_ingredients(
-    flat: list[dict],
+    flat: Iterable[FlatIngredient],
     canonical_list: list[dict] | None,
 ) -> list[dict]:
     """
@@ -53,51 +82,41 @@ def merge_flat_ingredients(
     units (e.g. "3 medium" and "2 lb" of potato) become one line: "3 medium + 2 lb".
     Same unit is summed (e.g. 2 tbsp + 1 tbsp -> 3 tbsp). The grocery agent interprets the combined string.
     """
-    def name_key_for(i: int) -> str:
-        row = flat[i]
-        if canonical_list and i < len(canonical_list):
-            c = canonical_list[i]
-            return (c.get("name") or "").strip().lower() or normalize_name_for_key(row["name"])
-        return normalize_name_for_key(row["name"])
-
-    # (name_key, form) -> (list of (total, unit), all_pantry, any_optional, category)
-    merged: dict[tuple, tuple[list[tuple[float | None, str]], bool, bool, str]] = {}
+    n_canonical = len(canonical_list) if canonical_list else 0
+    merged: defaultdict[tuple[str, str], _MergedLine] = defaultdict(_MergedLine)
     for i, row in enumerate(flat):
-        k = (name_key_for(i), row["form"])
-        total = row["total"]
-        disp_unit = (row["unit"] or "").strip() or ""
-        if canonical_list and i < len(canonical_list):
-            disp_unit = (canonical_list[i].get("unit") or "").strip().lower() or disp_unit
+        c = canonical_list[i] if i < n_canonical else None
+        name_key = ((c.get("name") or "").strip().lower() if c else "") or normalize_name_for_key(row.name)
+        total = row.total
+        disp_unit = (row.unit or "").strip() or ""
+        if c:
+            disp_unit = (c.get("unit") or "").strip().lower() or disp_unit
         disp_unit = normalize_unit_for_key(disp_unit) or disp_unit
-        if k not in merged:
-            merged[k] = ([(total, disp_unit)], row["pantry_item"], row["optional"], row["category"])
-        else:
-            amounts, all_pantry, any_opt, cat = merged[k]
-            unit_norm = normalize_unit_for_key(disp_unit)
-            found = False
-            for j, (t, u) in enumerate(amounts):
-                if normalize_unit_for_key(u) == unit_norm:
-                    if t is not None and total is not None:
-                        amounts[j] = (t + total, u)
-                    elif total is not None:
-                        amounts[j] = (total, u)
-                    found = True
-                    break
-            if not found:
-                amounts.append((total, disp_unit))
-            merged[k] = (amounts, all_pantry and row["pantry_item"], any_opt or row["optional"], cat)
+        unit_norm = normalize_unit_for_key(disp_unit)
+        line = merged[(name_key, row.form)]
+        entry = line.amounts_by_norm.get(unit_norm)
+        if entry is None:
+            line.amounts_by_norm[unit_norm] = [total, disp_unit]
+        elif total is not None:
+            entry[0] = entry[0] + total if entry[0] is not None else total
+        line.pantry_item = line.pantry_item and row.pantry_item
+        line.optional = line.optional or row.optional
+        if line.category is None:
+            line.category = row.category
     out = []
-    for idx, ((name_key, form_val), (amounts, pantry_item, optional, category)) in enumerate(sorted(merged.items(), key=lambda x: (x[0][1], x[0][0]))):
+    for idx, key in enumerate(sorted(merged, key=lambda k: (k[1], k[0]))):
+        name_key, form_val = key
+        line = merged[key]
         display_name = normalize_name_for_display(name_key)
-        amount_str = " + ".join(_format_amount(t, u) for t, u in amounts)
+        amount_str = " + ".join(_format_amount(t, u) for t, u in line.amounts_by_norm.values())
         out.append({
             "index": idx,
             "name": display_name,
             "unit": None,
             "form": form_val,
             "amount_str": amount_str,
-            "pantry_item": pantry_item,
-            "optional": optional,
-            "category": category,
+            "pantry_item": line.pantry_item,
+            "optional": line.optional,
+            "category": line.category,
         })
     return out
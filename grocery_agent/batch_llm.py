@@ -0,0 +1,76 @@
+"""
+Coalesce concurrent LLM requests into batched calls.
+
+A request that arrives while nothing is in flight is sent right away (optionally after a short
+window), so a single user sees no extra latency. Requests that arrive while a call is running queue
+up and go out together, up to max_batch per call, as soon as it finishes.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class RequestBatcher(Generic[T, R]):
+    """
+    Feed submitted items to handler(items) -> results in batches of at most max_batch.
+    handler must return one result per item, in order; a result that is an exception is raised
+    to that item's caller only. An exception raised by handler itself fails the whole batch.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list[T]], Awaitable[list[R | BaseException]]],
+        max_batch: int = 8,
+        window: float = 0.0,
+    ) -> None:
+        self._handler = handler
+        self._max_batch = max_batch
+        self._window = window
+        self._pending: list[tuple[T, asyncio.Future]] = []
+        self._drain_task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def submit(self, item: T) -> R:
+        """Queue item and wait for its result."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:  # e.g. a new asyncio.run(); futures from the old loop are unusable
+            self._pending, self._drain_task, self._loop = [], None, loop
+        fut = loop.create_future()
+        self._pending.append((item, fut))
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = loop.create_task(self._drain())
+        return await fut
+
+    async def _drain(self) -> None:
+        if self._window:
+            await asyncio.sleep(self._window)
+        while self._pending:
+            batch = self._pending[: self._max_batch]
+            del self._pending[: self._max_batch]
+            batch = [(item, fut) for item, fut in batch if not fut.done()]  # drop cancelled callers
+            if not batch:
+                continue
+            if len(batch) > 1:
+                logger.info("Batching %d LLM requests into one call", len(batch))
+            try:
+                results = await self._handler([item for item, _ in batch])
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            if len(results) != len(batch):
+                err = RuntimeError(f"Batch handler returned {len(results)} results for {len(batch)} items")
+                results = [err] * len(batch)
+            for (_, fut), result in zip(batch, results):
+                if fut.done():
+                    continue
+                if isinstance(result, BaseException):
+                    fut.set_exception(result)
+                else:
+                    fut.set_result(result)
@@ -1,8 +1,12 @@
 """
 SQLite DB for recipes and recipe ingredients.
-Single init script creates tables; no migrations for MVP.
+Single init script creates tables; migrations are tracked with PRAGMA user_version.
 """
+import atexit
+import math
 import sqlite3
+import threading
+from itertools import groupby
 from pathlib import Path
 from typing import Optional
 
@@ -12,29 +16,156 @@ from grocery_agent.quantity_parser import parse_quantity
 # Default DB path: project root / data / grocery.db
 DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data" / "grocery.db"
 
+# Bumped by each migration in _migrate (stored in PRAGMA user_version)
+SCHEMA_VERSION = 2
 
-def get_connection(db_path: Optional[Path] = None) -> sqlite3.Connection:
-    """Return a connection to the SQLite DB; create file and tables if needed."""
-    path = db_path or DEFAULT_DB_PATH
-    path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(path)
+# recipe_ingredients.category / .form are stored as small integer ids (enum declaration order).
+# Stored ids must stay stable: only append new enum members, never reorder or remove.
+_CAT_TO_ID = {e.value: i for i, e in enumerate(IngredientCategory)}
+_ID_TO_CAT = dict(enumerate(IngredientCategory))
+_FORM_TO_ID = {e.value: i for i, e in enumerate(IngredientForm)}
+_ID_TO_FORM = dict(enumerate(IngredientForm))
+_OTHER_CAT_ID = _CAT_TO_ID[IngredientCategory.OTHER.value]
+_FRESH_FORM_ID = _FORM_TO_ID[IngredientForm.FRESH.value]
+
+_RECIPE_INGREDIENTS_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {{table}} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        recipe_id INTEGER NOT NULL REFERENCES recipes(id) ON DELETE CASCADE,
+        name TEXT NOT NULL,
+        quantity_per_portion REAL,
+        unit TEXT,
+        category INTEGER NOT NULL DEFAULT {_OTHER_CAT_ID},
+        optional INTEGER NOT NULL DEFAULT 0,
+        pantry_item INTEGER NOT NULL DEFAULT 0,
+        form INTEGER NOT NULL DEFAULT {_FRESH_FORM_ID},
+        UNIQUE(recipe_id, name)
+    )
+"""
+
+# Shared by insert_recipe and replace_recipe_ingredients so both hit the same cached prepared statement
+_INSERT_INGREDIENT_SQL = (
+    "INSERT INTO recipe_ingredients (recipe_id, name, quantity_per_portion, unit, category, optional, pantry_item, form)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _apply_pragmas(conn: sqlite3.Connection, path: Path) -> None:
+    """
+    Tune the connection: WAL journal (readers see committed writes without blocking the writer,
+    e.g. checklist reads while a recipe is ingested), synchronous=NORMAL (no extra fsync per commit in WAL),
+    a 5 s busy timeout (wait for another writer instead of failing with "database is locked"),
+    in-memory temp tables, a ~20 MB page cache and up to 256 MB of memory-mapped reads.
+    page_size only takes effect when the file is created, so it must precede the switch to WAL.
+    """
+    if str(path) != ":memory:":
+        conn.execute("PRAGMA page_size=8192")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA mmap_size=268435456")
+    conn.executescript("""
+        PRAGMA synchronous=NORMAL;
+        PRAGMA busy_timeout=5000;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-20000;
+    """)
+
+
+class _SharedConnection(sqlite3.Connection):
+    """Per-thread connection to the default DB, kept open for the life of the thread; close() is a no-op."""
+
+    closed = False  # set by close_all()
+
+    def close(self) -> None:
+        pass
+
+
+# One open connection per thread for DEFAULT_DB_PATH (keeps the page cache warm across requests)
+_local = threading.local()
+# Every shared connection handed out, so close_all() can close them at shutdown
+_shared_conns: list[_SharedConnection] = []
+_shared_lock = threading.Lock()
+
+
+def _connect(path: Path, factory: type[sqlite3.Connection] = sqlite3.Connection) -> sqlite3.Connection:
+    if str(path) != ":memory:":
+        path.parent.mkdir(parents=True, exist_ok=True)
+    # Shared connections may be closed by close_all() from a different thread.
+    shared = factory is _SharedConnection
+    conn = sqlite3.connect(path, cached_statements=256, factory=factory, check_same_thread=not shared)
     conn.row_factory = sqlite3.Row
+    _apply_pragmas(conn, path)
+    return conn
+
+
+def get_connection(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    """
+    Return a connection to the SQLite DB; create the file if needed.
+    Without db_path, returns this thread's shared connection to DEFAULT_DB_PATH (opened on first use;
+    callers may still close() it, which is ignored). With db_path, opens a new private connection.
+    """
+    if db_path is not None:
+        return _connect(db_path)
+    conn = getattr(_local, "conn", None)
+    if conn is None or conn.closed:
+        conn = _connect(DEFAULT_DB_PATH, factory=_SharedConnection)
+        _local.conn = conn
+        with _shared_lock:
+            _shared_conns.append(conn)
     return conn
 
 
+def close_all() -> None:
+    """Close every shared per-thread connection (call on shutdown). The next get_connection() reopens."""
+    with _shared_lock:
+        conns = list(_shared_conns)
+        _shared_conns.clear()
+    for conn in conns:
+        conn.closed = True
+        sqlite3.Connection.close(conn)
+
+
+# CLI entry points (grocery_list, jumbo) never call close_all(); closing on exit checkpoints the WAL.
+atexit.register(close_all)
+
+
 def init_db(conn: Optional[sqlite3.Connection] = None, db_path: Optional[Path] = None) -> None:
-    """Create recipes and recipe_ingredients tables if they do not exist."""
+    """Create recipes, recipe_ingredients and llm_cache tables if they do not exist, then apply pending migrations."""
     if conn is None:
         conn = get_connection(db_path)
         try:
             _create_tables(conn)
-            _ensure_image_url_column(conn)
+            _migrate(conn)
             conn.commit()
         finally:
             conn.close()
     else:
         _create_tables(conn)
+        _migrate(conn)
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """
+    Run schema migrations newer than PRAGMA user_version, then bump it.
+    Once a DB is current this is a single PRAGMA read (no table_info scans on every start).
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version < 1:
         _ensure_image_url_column(conn)
+    if version < 2:
+        _migrate_enum_columns_to_ids(conn)
+    if version < SCHEMA_VERSION:
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    # Refresh query-planner stats if SQLite thinks they are stale (cheap no-op otherwise)
+    conn.execute("PRAGMA optimize")
+
+
+# (recipe_id, id) serves the recipe filter and ORDER BY id; the remaining columns make it covering,
+# so ingredient lookups are answered from the index without touching the table rows.
+_INGREDIENTS_COVER_INDEX_DDL = """
+    CREATE INDEX IF NOT EXISTS idx_ri_cover ON recipe_ingredients(
+        recipe_id, id, name, quantity_per_portion, unit, category, optional, pantry_item, form
+    )
+"""
 
 
 def _create_tables(conn: sqlite3.Connection) -> None:
@@ -48,21 +179,19 @@ def _create_tables(conn: sqlite3.Connection) -> None:
             created_at TEXT NOT NULL DEFAULT (datetime('now'))
         )
     """)
+    conn.execute(_RECIPE_INGREDIENTS_DDL.format(table="recipe_ingredients"))
+    # Cached LLM responses keyed by a hash of (model, prompt, input); see recipe.parse_recipe
     conn.execute("""
-        CREATE TABLE IF NOT EXISTS recipe_ingredients (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            recipe_id INTEGER NOT NULL REFERENCES recipes(id) ON DELETE CASCADE,
-            name TEXT NOT NULL,
-            quantity_per_portion REAL,
-            unit TEXT,
-            category TEXT NOT NULL DEFAULT 'other',
-            optional INTEGER NOT NULL DEFAULT 0,
-            pantry_item INTEGER NOT NULL DEFAULT 0,
-            form TEXT NOT NULL DEFAULT 'fresh',
-            UNIQUE(recipe_id, name)
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            response_json TEXT NOT NULL,
+            created_at TEXT NOT NULL DEFAULT (datetime('now'))
         )
     """)
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_recipe_ingredients_recipe_id ON recipe_ingredients(recipe_id)")
+    conn.execute(_INGREDIENTS_COVER_INDEX_DDL)
+    conn.execute("DROP INDEX IF EXISTS idx_recipe_ingredients_recipe_id")
+    conn.execute("DROP INDEX IF EXISTS idx_recipe_ingredients_recipe_id_id")
 
 
 def _ensure_image_url_column(conn: sqlite3.Connection) -> None:
@@ -72,33 +201,57 @@ def _ensure_image_url_column(conn: sqlite3.Connection) -> None:
         conn.execute("ALTER TABLE recipes ADD COLUMN image_url TEXT")
 
 
+def _migrate_enum_columns_to_ids(conn: sqlite3.Connection) -> None:
+    """Rebuild recipe_ingredients with INTEGER category/form ids if it still has the old TEXT columns."""
+    col_types = {row[1]: row[2].upper() for row in conn.execute("PRAGMA table_info(recipe_ingredients)").fetchall()}
+    if col_types.get("category") != "TEXT":
+        return
+    cat_case = " ".join(f"WHEN '{v}' THEN {i}" for v, i in _CAT_TO_ID.items())
+    form_case = " ".join(f"WHEN '{v}' THEN {i}" for v, i in _FORM_TO_ID.items())
+    with conn:
+        conn.execute(_RECIPE_INGREDIENTS_DDL.format(table="recipe_ingredients_v2"))
+        conn.execute(f"""
+            INSERT INTO recipe_ingredients_v2 (id, recipe_id, name, quantity_per_portion, unit, category, optional, pantry_item, form)
+            SELECT id, recipe_id, name, quantity_per_portion, unit,
+                   CASE category {cat_case} ELSE {_OTHER_CAT_ID} END,
+                   optional, pantry_item,
+                   CASE form {form_case} ELSE {_FRESH_FORM_ID} END
+            FROM recipe_ingredients
+        """)
+        conn.execute("DROP TABLE recipe_ingredients")
+        conn.execute("ALTER TABLE recipe_ingredients_v2 RENAME TO recipe_ingredients")
+        conn.execute(_INGREDIENTS_COVER_INDEX_DDL)
+
+
 def insert_recipe(conn: sqlite3.Connection, recipe: Recipe) -> int:
-    """Insert a Recipe and its ingredients; return recipe id. Computes quantity_per_portion from quantity and portions."""
-    image_url = getattr(recipe, "image_url", None) or None
-    cur = conn.execute(
-        "INSERT INTO recipes (name, instructions, source_url, portions, image_url) VALUES (?, ?, ?, ?, ?)",
-        (recipe.name, recipe.instructions, recipe.source_url, recipe.portions, image_url),
-    )
-    recipe_id = cur.lastrowid
+    """Insert a Recipe and its ingredients in one transaction; return recipe id. Computes quantity_per_portion from quantity and portions."""
+    image_url = recipe.image_url or None
     portions = recipe.portions or 4
     if portions <= 0:
         portions = 4
-    for ing in recipe.ingredients:
-        qty = parse_quantity(ing.quantity)
-        if qty is not None:
-            quantity_per_portion = qty / portions
-            unit = ing.unit or ""
-        else:
-            quantity_per_portion = None
-            unit = (ing.unit or "to taste").strip() or "to taste"
-        optional = 1 if getattr(ing, "optional", False) else 0
-        pantry_item = 1 if getattr(ing, "pantry_item", False) else 0
-        form_val = getattr(ing, "form", IngredientForm.FRESH)
-        form_str = form_val.value if hasattr(form_val, "value") else str(form_val)
-        conn.execute(
-            "INSERT INTO recipe_ingredients (recipe_id, name, quantity_per_portion, unit, category, optional, pantry_item, form) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-            (recipe_id, ing.name, quantity_per_portion, unit, ing.category.value, optional, pantry_item, form_str),
+    parse = parse_quantity  # bound locally for the per-ingredient loop
+    # Recipe row and all ingredient rows commit together (or roll back together)
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO recipes (name, instructions, source_url, portions, image_url) VALUES (?, ?, ?, ?, ?)",
+            (recipe.name, recipe.instructions, recipe.source_url, recipe.portions, image_url),
         )
+        recipe_id = cur.lastrowid
+        rows = []
+        append = rows.append
+        for ing in recipe.ingredients:
+            qty = parse(ing.quantity)
+            if qty is not None:
+                quantity_per_portion = qty / portions
+                unit = ing.unit or ""
+            else:
+                quantity_per_portion = None
+                unit = (ing.unit or "to taste").strip() or "to taste"
+            append((
+                recipe_id, ing.name, quantity_per_portion, unit, _CAT_TO_ID[ing.category.value],
+                1 if ing.optional else 0, 1 if ing.pantry_item else 0, _FORM_TO_ID[ing.form.value],
+            ))
+        conn.executemany(_INSERT_INGREDIENT_SQL, rows)
     return recipe_id
 
 
@@ -124,10 +277,10 @@ def replace_recipe_ingredients(
     ingredients: list[dict],
 ) -> None:
     """
-    Replace all ingredients for a recipe. ingredients: list of dicts with
+    Replace all ingredients for a recipe in a single transaction. ingredients: list of dicts with
     name, quantity_per_portion (float|None), unit (str), category (str), optional (bool), pantry_item (bool), form (str).
     """
-    conn.execute("DELETE FROM recipe_ingredients WHERE recipe_id = ?", (recipe_id,))
+    rows = []
     for ing in ingredients:
         name = (ing.get("name") or "").strip()
         if not name:
@@ -138,73 +291,97 @@ def replace_recipe_ingredients(
                 qpp = float(qpp)
             except (TypeError, ValueError):
                 qpp = None
+            if qpp is not None and not math.isfinite(qpp):
+                qpp = None
         unit = (ing.get("unit") or "").strip() or None
-        category = (ing.get("category") or "other").strip().lower()
-        if category not in [e.value for e in IngredientCategory]:
-            category = "other"
+        category_id = _CAT_TO_ID.get((ing.get("category") or "other").strip().lower(), _OTHER_CAT_ID)
         optional = bool(ing.get("optional"))
         pantry_item = bool(ing.get("pantry_item"))
-        form = (ing.get("form") or "fresh").strip().lower()
-        if form not in [e.value for e in IngredientForm]:
-            form = "fresh"
-        conn.execute(
-            """INSERT INTO recipe_ingredients (recipe_id, name, quantity_per_portion, unit, category, optional, pantry_item, form)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (recipe_id, name, qpp, unit, category, 1 if optional else 0, 1 if pantry_item else 0, form),
-        )
+        form_id = _FORM_TO_ID.get((ing.get("form") or "fresh").strip().lower(), _FRESH_FORM_ID)
+        rows.append((recipe_id, name, qpp, unit, category_id, 1 if optional else 0, 1 if pantry_item else 0, form_id))
+    # DELETE + INSERT in one transaction so a failed insert does not leave the recipe empty
+    with conn:
+        conn.execute("DELETE FROM recipe_ingredients WHERE recipe_id = ?", (recipe_id,))
+        conn.executemany(_INSERT_INGREDIENT_SQL, rows)
 
 
-def recipe_from_row(
-    conn: sqlite3.Connection, recipe_id: int
-) -> Optional[Recipe]:
-    """Load a Recipe by id with its ingredients (quantity_per_portion and unit from DB)."""
-    row = conn.execute(
-        "SELECT id, name, instructions, source_url, portions, image_url FROM recipes WHERE id = ?",
-        (recipe_id,),
-    ).fetchone()
-    if not row:
-        return None
-    portions = float(row["portions"]) if row["portions"] is not None else 4
-    ing_rows = conn.execute(
-        "SELECT name, quantity_per_portion, unit, category, optional, pantry_item, form FROM recipe_ingredients WHERE recipe_id = ? ORDER BY id",
-        (recipe_id,),
-    ).fetchall()
+# Recipe columns + its ingredient columns (NULL for a recipe without ingredients), one row per ingredient
+_RECIPE_JOIN_SQL = """
+    SELECT r.id, r.name, r.instructions, r.source_url, r.portions, r.image_url,
+           i.name AS ing_name, i.quantity_per_portion, i.unit, i.category, i.optional, i.pantry_item, i.form
+    FROM recipes r
+    LEFT JOIN recipe_ingredients i ON i.recipe_id = r.id
+"""
+
+
+def _recipe_from_joined_rows(rows: list[sqlite3.Row]) -> Recipe:
+    """
+    Build a Recipe from the _RECIPE_JOIN_SQL rows of one recipe (recipe columns repeat on every row).
+    Rows come from our own schema with types already normalized here, so the models are built with
+    model_construct (no Pydantic validation pass); validation stays at the LLM / form boundaries.
+    """
+    _, name, instructions, source_url, portions, image_url = rows[0][:6]
     ingredients = []
-    for r in ing_rows:
-        qpp = r["quantity_per_portion"]
+    construct = Ingredient.model_construct
+    for *_, ing_name, qpp, unit, category_id, optional, pantry_item, form_id in rows:
+        if ing_name is None:
+            continue
         try:
             qpp = float(qpp) if qpp is not None else None
         except (TypeError, ValueError):
             qpp = None
-        optional = bool(r["optional"]) if "optional" in r.keys() else False
-        pantry_item = bool(r["pantry_item"]) if "pantry_item" in r.keys() else False
-        form_str = r["form"] if "form" in r.keys() and r["form"] else "fresh"
-        try:
-            form_enum = IngredientForm(form_str)
-        except ValueError:
-            form_enum = IngredientForm.FRESH
         ingredients.append(
-            Ingredient(
-                name=r["name"],
+            construct(
+                name=ing_name,
                 quantity=None,
-                unit=r["unit"] or None,
-                category=IngredientCategory(r["category"]),
+                unit=unit or None,
+                category=_ID_TO_CAT.get(category_id, IngredientCategory.OTHER),
                 quantity_per_portion=qpp,
-                optional=optional,
-                pantry_item=pantry_item,
-                form=form_enum,
+                optional=bool(optional),
+                pantry_item=bool(pantry_item),
+                form=_ID_TO_FORM.get(form_id, IngredientForm.FRESH),
             )
         )
-    return Recipe(
-        name=row["name"],
-        portions=portions,
+    return Recipe.model_construct(
+        name=name,
+        portions=float(portions) if portions is not None else 4,
         ingredients=ingredients,
-        instructions=row["instructions"],
-        source_url=row["source_url"],
-        image_url=row["image_url"] if "image_url" in row.keys() and row["image_url"] else None,
+        instructions=instructions,
+        source_url=source_url,
+        image_url=image_url or None,
     )
 
 
+def recipe_from_row(
+    conn: sqlite3.Connection, recipe_id: int
+) -> Optional[Recipe]:
+    """Load a Recipe by id with its ingredients (quantity_per_portion and unit from DB) in one query."""
+    rows = conn.execute(
+        _RECIPE_JOIN_SQL + " WHERE r.id = ? ORDER BY i.id",
+        (recipe_id,),
+    ).fetchall()
+    if not rows:
+        return None
+    return _recipe_from_joined_rows(rows)
+
+
+def recipes_from_ids(conn: sqlite3.Connection, recipe_ids: list[int]) -> dict[int, Recipe]:
+    """
+    Load several recipes with one query. Returns {recipe_id: Recipe} in the order of recipe_ids;
+    ids that do not exist are left out.
+    """
+    unique_ids = list(dict.fromkeys(recipe_ids))
+    if not unique_ids:
+        return {}
+    placeholders = ",".join("?" * len(unique_ids))
+    rows = conn.execute(
+        _RECIPE_JOIN_SQL + f" WHERE r.id IN ({placeholders}) ORDER BY r.id, i.id",
+        unique_ids,
+    ).fetchall()
+    by_id = {rid: _recipe_from_joined_rows(list(group)) for rid, group in groupby(rows, key=lambda r: r[0])}
+    return {rid: by_id[rid] for rid in unique_ids if rid in by_id}
+
+
 def delete_recipe(conn: sqlite3.Connection, recipe_id: int) -> bool:
     """Delete a recipe and its ingredients (CASCADE). Returns True if recipe existed."""
     cur = conn.execute("DELETE FROM recipes WHERE id = ?", (recipe_id,))
@@ -213,13 +390,37 @@ def delete_recipe(conn: sqlite3.Connection, recipe_id: int) -> bool:
 
 def list_recipes(conn: sqlite3.Connection) -> list[dict]:
     """Return all saved recipes as [{id, name, portions, image_url?}, ...] for the grocery-list picker."""
-    rows = conn.execute(
+    cur = conn.cursor()
+    cur.row_factory = None  # plain tuples: rows are only unpacked here
+    rows = cur.execute(
         "SELECT id, name, portions, image_url FROM recipes ORDER BY name"
     ).fetchall()
     result = []
-    for r in rows:
-        rec = {"id": r["id"], "name": r["name"], "portions": float(r["portions"]) if r["portions"] is not None else 4}
-        if "image_url" in r.keys() and r["image_url"]:
-            rec["image_url"] = r["image_url"]
-        result.append(rec)
+    append = result.append
+    for rid, name, portions, image_url in rows:
+        rec = {"id": rid, "name": name, "portions": float(portions) if portions is not None else 4}
+        if image_url:
+            rec["image_url"] = image_url
+        append(rec)
     return result
+
+
+def get_cached_llm_response(conn: sqlite3.Connection, key: str, max_age_hours: float = 24) -> str | None:
+    """Return the cached response JSON for key if it is younger than max_age_hours, else None."""
+    row = conn.execute(
+        "SELECT response_json FROM llm_cache WHERE key = ? AND created_at >= datetime('now', ?)",
+        (key, f"-{max_age_hours} hours"),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def put_cached_llm_response(
+    conn: sqlite3.Connection, key: str, model: str, response_json: str, max_age_hours: float = 24
+) -> None:
+    """Store a response for key (replacing any older one) and drop entries older than max_age_hours."""
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, model, response_json) VALUES (?, ?, ?)",
+            (key, model, response_json),
+        )
+        conn.execute("DELETE FROM llm_cache WHERE created_at < datetime('now', ?)", (f"-{max_age_hours} hours",))
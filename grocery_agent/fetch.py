@@ -1,4 +1,6 @@
 """Fetch main text and main image from a recipe URL."""
+import asyncio
+import importlib.util
 import re
 from urllib.parse import urljoin
 
@@ -12,27 +14,85 @@ DEFAULT_HEADERS = {
     "Accept-Language": "en-US,en;q=0.9",
 }
 
-# Match og:image or twitter:image meta tags (content="...")
-_IMAGE_META_RE = re.compile(
-    r'<meta[^>]+(?:property|name)=["\'](?:og:image|twitter:image)["\'][^>]+content=["\']([^"\']+)["\']'
-    r'|<meta[^>]+content=["\']([^"\']+)["\'][^>]+(?:property|name)=["\'](?:og:image|twitter:image)["\']',
-    re.IGNORECASE,
-)
+# One pooled client per event loop, reused across fetches (keep-alive + HTTP/2 when h2 is installed)
+_CLIENT: httpx.AsyncClient | None = None
+_CLIENT_LOOP: asyncio.AbstractEventLoop | None = None
+
+
+def _client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it for the running event loop if needed."""
+    global _CLIENT, _CLIENT_LOOP
+    loop = asyncio.get_running_loop()
+    if _CLIENT is None or _CLIENT.is_closed or _CLIENT_LOOP is not loop:
+        _CLIENT = httpx.AsyncClient(
+            follow_redirects=True,
+            headers=DEFAULT_HEADERS,
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+        _CLIENT_LOOP = loop
+    return _CLIENT
+
+
+async def aclose_client() -> None:
+    """Close the shared client (call on app shutdown)."""
+    global _CLIENT, _CLIENT_LOOP
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+    _CLIENT = _CLIENT_LOOP = None
+
+
+# <meta ...> tags and their attributes; matched separately so attribute order doesn't matter
+_META_TAG_RE = re.compile(r"<meta\s[^>]*>", re.IGNORECASE)
+_META_ATTR_RE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+_IMAGE_META_KEYS = frozenset(("og:image", "twitter:image"))
+
+
+def _find_image_meta(html: str) -> str | None:
+    """Return the content of the first og:image / twitter:image meta tag, or None."""
+    for tag in _META_TAG_RE.finditer(html):
+        attrs = {k.lower(): a or b for k, a, b in _META_ATTR_RE.findall(tag.group(0))}
+        key = (attrs.get("property") or attrs.get("name") or "").lower()
+        if key in _IMAGE_META_KEYS and attrs.get("content"):
+            return attrs["content"]
+    return None
+
+
+# og:image is almost always in <head>; read only this much of the page before falling back to a full GET
+_IMAGE_PREFIX_BYTES = 32 * 1024
+
+
+async def _fetch_html_prefix(client: httpx.AsyncClient, page_url: str) -> tuple[str, bool]:
+    """GET up to _IMAGE_PREFIX_BYTES of the page, stopping at </head>. Returns (html, is_complete_page)."""
+    buf = bytearray()
+    headers = {"Range": f"bytes=0-{_IMAGE_PREFIX_BYTES - 1}"}
+    async with client.stream("GET", page_url, headers=headers) as resp:
+        if resp.status_code == 416:  # range not satisfiable: let the caller retry with a plain GET
+            return "", False
+        resp.raise_for_status()
+        complete = resp.status_code != 206
+        async for chunk in resp.aiter_bytes():
+            buf += chunk
+            if len(buf) >= _IMAGE_PREFIX_BYTES or b"</head" in buf.lower():
+                complete = False
+                break
+        encoding = resp.charset_encoding or "utf-8"
+    return buf.decode(encoding, errors="replace"), complete
 
 
 async def fetch_recipe_image_url(page_url: str) -> str | None:
     """Fetch the recipe page HTML and return the main image URL (og:image or twitter:image), or None."""
+    client = _client()
     try:
-        async with httpx.AsyncClient(follow_redirects=True, headers=DEFAULT_HEADERS) as client:
+        html, complete = await _fetch_html_prefix(client, page_url)
+        found = _find_image_meta(html)
+        if found is None and not complete:
             resp = await client.get(page_url)
             resp.raise_for_status()
-            html = resp.text
-    except (httpx.HTTPStatusError, httpx.RequestError):
-        return None
-    m = _IMAGE_META_RE.search(html)
-    if not m:
+            found = _find_image_meta(resp.text)
+    except (httpx.HTTPStatusError, httpx.RequestError, LookupError):
         return None
-    raw = (m.group(1) or m.group(2) or "").strip()
+    raw = (found or "").strip()
     if not raw or not raw.startswith(("http", "//")):
         return urljoin(page_url, raw) if raw else None
     if raw.startswith("//"):
@@ -42,11 +102,11 @@ async def fetch_recipe_image_url(page_url: str) -> str | None:
 
 async def fetch_recipe_text(url: str) -> str:
     """Fetch URL and return main article/recipe text (strip HTML, ads, nav)."""
-    async with httpx.AsyncClient(follow_redirects=True, headers=DEFAULT_HEADERS) as client:
-        resp = await client.get(url)
-        resp.raise_for_status()
-        html = resp.text
-    extracted = trafilatura.extract(html, include_comments=False, include_tables=False)
+    resp = await _client().get(url)
+    resp.raise_for_status()
+    html = resp.text
+    # CPU-bound (lxml + heuristics): run in a worker thread so concurrent fetches keep going
+    extracted = await asyncio.to_thread(trafilatura.extract, html, include_comments=False, include_tables=False)
     if not extracted or not extracted.strip():
         return resp.text[:50000]  # fallback: raw text truncated
     return extracted.strip()
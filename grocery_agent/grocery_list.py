@@ -20,14 +20,19 @@ CLI (JSON to stdout):
   uv run python -m grocery_agent.grocery_list 1 2 --portions 1=4 2=6
   uv run python -m grocery_agent.grocery_list 1 2 --selected 0 1 3   # only those indices
 """
+import argparse
 import asyncio
 import json
-import sys
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson  # optional: faster read/write of the grocery list file
+except ImportError:
+    orjson = None
+
 from grocery_agent.aggregate import flat_ingredients, merge_flat_ingredients
-from grocery_agent.db import get_connection, recipe_from_row
+from grocery_agent.db import get_connection, recipes_from_ids
 from grocery_agent.ingredient_normalizer import normalize_ingredients_with_llm
 
 # Path where the web app writes the list and run_jumbo.py reads it (single source of truth)
@@ -38,7 +43,10 @@ def write_grocery_list(items: list[dict[str, Any]], path: Path | None = None) ->
     """Write the grocery list to a JSON file for the jumbo bot to read."""
     p = path or GROCERY_LIST_PATH
     p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json.dumps({"items": items}, indent=2), encoding="utf-8")
+    if orjson is not None:
+        p.write_bytes(orjson.dumps({"items": items}, option=orjson.OPT_INDENT_2))
+    else:
+        p.write_text(json.dumps({"items": items}, indent=2), encoding="utf-8")
 
 
 def load_grocery_list(path: Path | None = None) -> list[dict[str, Any]] | None:
@@ -47,12 +55,17 @@ def load_grocery_list(path: Path | None = None) -> list[dict[str, Any]] | None:
     if not p.exists():
         return None
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
+        data = orjson.loads(p.read_bytes()) if orjson is not None else json.loads(p.read_text(encoding="utf-8"))
         return data.get("items") if isinstance(data, dict) else None
-    except (json.JSONDecodeError, OSError):
+    except (ValueError, OSError):  # json/orjson decode errors are ValueErrors
         return None
 
 
+def _recipes_by_id(recipe_ids: list[int]) -> dict:
+    """recipes_from_ids on this thread's shared connection (not closed here)."""
+    return recipes_from_ids(get_connection(), recipe_ids)
+
+
 async def get_grocery_list(
     recipe_ids: list[int],
     portions_override: dict[int, int] | None = None,
@@ -69,17 +82,12 @@ async def get_grocery_list(
     Returns list of dicts with keys: name, amount_str, form, category, optional, pantry_item.
     """
     portions_override = portions_override or {}
-    conn = get_connection()
-    try:
-        recipes = []
-        for rid in recipe_ids:
-            r = recipe_from_row(conn, rid)
-            if r:
-                if rid in portions_override:
-                    r.portions = portions_override[rid]
-                recipes.append(r)
-    finally:
-        conn.close()
+    # Blocking SQLite read: run it off the event loop (workers use their own per-thread connection)
+    by_id = await asyncio.to_thread(_recipes_by_id, recipe_ids)
+    for rid, r in by_id.items():
+        if rid in portions_override:
+            r.portions = portions_override[rid]
+    recipes = list(by_id.values())
     if not recipes:
         return []
     flat = flat_ingredients(recipes)
@@ -139,29 +147,14 @@ def _parse_portions(s: str) -> dict[int, int]:
 
 def main() -> None:
     """CLI: recipe IDs as positional args, optional --portions 1=4 2=6, optional --selected 0 1 3."""
-    args = list(sys.argv[1:])
-    portions_override: dict[int, int] = {}
-    selected_indices: list[int] | None = None
-    if "--portions" in args:
-        i = args.index("--portions")
-        args.pop(i)
-        if i < len(args):
-            portions_override = _parse_portions(args.pop(i))
-    if "--selected" in args:
-        i = args.index("--selected")
-        args.pop(i)
-        selected_indices = []
-        while i < len(args) and args[i].isdigit():
-            selected_indices.append(int(args.pop(i)))
-    recipe_ids = []
-    for a in args:
-        try:
-            recipe_ids.append(int(a))
-        except ValueError:
-            break
-    if not recipe_ids:
-        print("Usage: python -m grocery_agent.grocery_list <recipe_id> [recipe_id ...] [--portions 1=4 2=6] [--selected 0 1 3]", file=sys.stderr)
-        sys.exit(1)
+    parser = argparse.ArgumentParser(prog="python -m grocery_agent.grocery_list", description="Print the grocery list as JSON.")
+    parser.add_argument("recipe_ids", nargs="+", type=int, metavar="recipe_id")
+    parser.add_argument("--portions", nargs="+", default=[], metavar="ID=N", help="portion overrides, e.g. 1=4 2=6")
+    parser.add_argument("--selected", nargs="*", type=int, default=None, metavar="INDEX", help="only these checklist indices")
+    ns = parser.parse_args()
+    recipe_ids = ns.recipe_ids
+    portions_override = _parse_portions(" ".join(ns.portions))
+    selected_indices = ns.selected
     items = asyncio.run(get_grocery_list(recipe_ids, portions_override or None, selected_indices))
     print(json.dumps(items, indent=2))
 
@@ -7,7 +7,15 @@ Two modes:
 - LLM: one call per checklist to canonicalize all ingredient names (handles any food).
 """
 
+import asyncio
+import itertools
+import json
 import logging
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
 
 from pydantic import BaseModel, Field
 
@@ -122,10 +130,39 @@ UNIT_ALIASES: dict[str, str] = {
 }
 
 
+# Trailing words that don't change what you buy ("garlic cloves, minced" -> garlic)
+_PREP_WORDS = frozenset((
+    "chopped", "minced", "diced", "sliced", "grated", "crushed", "peeled", "softened", "melted",
+    "beaten", "finely", "roughly", "thinly", "freshly", "to", "taste", "for", "serving", "and", "or",
+))
+_MAX_NAME_WORDS = max(len(k.split()) for k in CANONICAL_INGREDIENT_NAMES)
+
+
+def canonicalize_substring(s: str) -> str | None:
+    """
+    Longest known name at the start of s, when everything after it is preparation words.
+    Returns the canonical name, or None. Used as the static fallback for free-form names.
+    """
+    words = s.replace(",", " ").lower().split()
+    tail_ok = len(words)  # words[i:] are all prep words for every i >= tail_ok
+    while tail_ok > 0 and words[tail_ok - 1] in _PREP_WORDS:
+        tail_ok -= 1
+    for n in range(min(len(words), _MAX_NAME_WORDS), max(tail_ok, 1) - 1, -1):
+        canonical = CANONICAL_INGREDIENT_NAMES.get(" ".join(words[:n]))
+        if canonical is not None:
+            return canonical
+    return None
+
+
+# Memoized: the same names/units repeat across recipes and rows. The static maps are not mutated at runtime.
+@lru_cache(maxsize=4096)
 def normalize_name_for_key(raw: str) -> str:
     """Return lowercase canonical name for merge key. Unknown names pass through lowercased."""
     s = (raw or "").strip().lower()
-    return CANONICAL_INGREDIENT_NAMES.get(s, s)
+    canonical = CANONICAL_INGREDIENT_NAMES.get(s)
+    if canonical is None:
+        canonical = canonicalize_substring(s) or s
+    return canonical
 
 
 def normalize_name_for_display(normalized_key: str) -> str:
@@ -135,6 +172,7 @@ def normalize_name_for_display(normalized_key: str) -> str:
     return normalized_key.replace("-", " ").title()
 
 
+@lru_cache(maxsize=4096)
 def normalize_unit_for_key(raw: str | None) -> str:
     """Return canonical unit for merge key. Unknown units pass through lowercased."""
     s = (raw or "").strip().lower()
@@ -165,32 +203,132 @@ Rules:
 - Keep the unit meaning: if input is "2 tbsp" output unit "tbsp"; if "to taste" output "to taste"."""
 
 
-async def normalize_ingredients_with_llm(flat_list: list[dict]) -> list[dict]:
+# (raw name, raw unit) -> {"name", "unit"} from earlier LLM calls, persisted so restarts stay warm.
+# Least recently used entries are evicted first once it holds _NORM_CACHE_MAX.
+NORM_CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "norm_cache.json"
+_NORM_CACHE_MAX = 4096
+# Long uncached lists are split into chunks normalized concurrently (shorter calls finish sooner)
+_NORM_CHUNK_SIZE = 25
+_NORM_PARALLEL_MIN = 30
+_NORM_MAX_CONCURRENCY = 6
+_norm_cache: OrderedDict[tuple[str, str], dict[str, str]] | None = None
+# Snapshots are numbered when taken; a write skips any snapshot older than the last one written
+_norm_cache_write_lock = threading.Lock()
+_norm_cache_snapshots = itertools.count(1)
+_norm_cache_written = 0
+
+
+def _read_norm_cache() -> OrderedDict[tuple[str, str], dict[str, str]]:
+    """Load NORM_CACHE_PATH (empty if missing or unreadable). Blocking; called via asyncio.to_thread."""
+    cache: OrderedDict[tuple[str, str], dict[str, str]] = OrderedDict()
+    try:
+        data = json.loads(NORM_CACHE_PATH.read_text(encoding="utf-8"))
+        for name, unit, c_name, c_unit in data.get("entries", []):
+            cache[(name, unit)] = {"name": c_name, "unit": c_unit}
+    except (OSError, ValueError, TypeError, AttributeError):
+        pass
+    return cache
+
+
+async def _get_norm_cache() -> OrderedDict[tuple[str, str], dict[str, str]]:
+    """Return the in-process normalization cache, loading it from NORM_CACHE_PATH on first use."""
+    global _norm_cache
+    if _norm_cache is None:
+        loaded = await asyncio.to_thread(_read_norm_cache)
+        if _norm_cache is None:  # a concurrent first call may have finished loading meanwhile
+            _norm_cache = loaded
+    return _norm_cache
+
+
+def _trim_norm_cache(cache: OrderedDict[tuple[str, str], dict[str, str]]) -> list[list[str]]:
+    """Evict least recently used entries beyond _NORM_CACHE_MAX; return the rows to persist."""
+    while len(cache) > _NORM_CACHE_MAX:
+        cache.popitem(last=False)
+    return [[name, unit, c["name"], c["unit"]] for (name, unit), c in cache.items()]
+
+
+def _write_norm_cache(snapshot: int, entries: list[list[str]]) -> None:
+    """
+    Atomically replace NORM_CACHE_PATH with the rows of snapshot, unless a newer snapshot was
+    already written (worker threads can finish out of order). Blocking; called via asyncio.to_thread.
+    """
+    global _norm_cache_written
+    with _norm_cache_write_lock:
+        if snapshot <= _norm_cache_written:
+            return
+        try:
+            NORM_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp = NORM_CACHE_PATH.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps({"entries": entries}), encoding="utf-8")
+            os.replace(tmp, NORM_CACHE_PATH)
+            _norm_cache_written = snapshot
+        except OSError as e:
+            logger.warning("Could not write normalization cache: %s", e)
+
+
+async def normalize_ingredients_with_llm(flat_list: list) -> list[dict]:
     """
-    Call the LLM to get canonical (name, unit) for each ingredient. One API call per checklist.
-    flat_list: list of dicts with at least "name", "unit" (and optionally "form").
-    Returns list of {"name": str, "unit": str} in the same order. On failure returns empty list
-    (caller should fall back to static normalizer).
+    Call the LLM to get canonical (name, unit) for each ingredient. At most one API call per checklist,
+    except for long lists (see below).
+    flat_list: FlatIngredient rows from aggregate.flat_ingredients (uses .name and .unit).
+    Returns list of {"name": str, "unit": str} in the same order. If only some LLM calls fail, the
+    lines they covered get {} and merge_flat_ingredients uses the static normalizer for just those.
+    If nothing could be normalized, returns an empty list (caller falls back to static normalizer).
 
     Uses get_generic_llm() (Google/Gemini) so structured output is supported.
     On failure (no GOOGLE_API_KEY or API error) returns [] and caller uses static normalizer.
+    Lines already normalized by an earlier call are served from the cache; only new ones are sent,
+    split into concurrent calls of _NORM_CHUNK_SIZE when there are _NORM_PARALLEL_MIN or more.
     """
     if not flat_list:
         return []
+    keys = [((row.name or "").strip(), (row.unit or "").strip()) for row in flat_list]
+    cache = await _get_norm_cache()
+    # Hits are copied out now, so a concurrent call trimming the cache cannot take them away
+    found: dict[tuple[str, str], dict[str, str]] = {}
+    for k in keys:
+        if k in cache:
+            cache.move_to_end(k)
+            found[k] = cache[k]
+    missing = list(dict.fromkeys(k for k in keys if k not in found))
+    if missing:
+        if len(missing) < _NORM_PARALLEL_MIN:
+            chunks = [missing]
+        else:
+            chunks = [missing[i : i + _NORM_CHUNK_SIZE] for i in range(0, len(missing), _NORM_CHUNK_SIZE)]
+        sem = asyncio.Semaphore(_NORM_MAX_CONCURRENCY)
+
+        async def run(chunk: list[tuple[str, str]]) -> list[dict[str, str]]:
+            async with sem:
+                return await _normalize_with_llm(chunk)
+
+        results = await asyncio.gather(*(run(c) for c in chunks))
+        for chunk, canonical in zip(chunks, results):
+            if canonical:
+                found.update(zip(chunk, canonical))
+                cache.update(zip(chunk, canonical))
+        if any(results):
+            # Numbered and copied together on the loop thread, so the number orders the snapshots
+            snapshot, entries = next(_norm_cache_snapshots), _trim_norm_cache(cache)
+            await asyncio.to_thread(_write_norm_cache, snapshot, entries)
+        if not found:
+            return []
+    # Lines whose chunk failed come back as {}, which merge_flat_ingredients normalizes statically
+    return [dict(found.get(k, {})) for k in keys]
+
+
+async def _normalize_with_llm(keys: list[tuple[str, str]]) -> list[dict[str, str]]:
+    """One LLM call for the given (name, unit) pairs. Returns canonical dicts in order, or [] on failure."""
     try:
         from browser_use.llm.messages import SystemMessage, UserMessage
         from grocery_agent.llm import get_generic_llm
 
         llm = get_generic_llm()
-        lines = []
-        for row in flat_list:
-            name = (row.get("name") or "").strip()
-            unit = (row.get("unit") or "").strip() or "(no unit)"
-            lines.append(f"- {name} | {unit}")
+        lines = [f"- {name} | {unit or '(no unit)'}" for name, unit in keys]
         user_content = "Normalize these ingredients (one per line). Output the list in the SAME ORDER.\n\n" + "\n".join(lines)
 
         messages = [
-            SystemMessage(content=NORMALIZE_SYSTEM_PROMPT),
+            SystemMessage(content=NORMALIZE_SYSTEM_PROMPT, cache=True),
             UserMessage(content=user_content),
         ]
         result = await llm.ainvoke(messages, output_format=CanonicalIngredientList)
@@ -199,11 +337,11 @@ async def normalize_ingredients_with_llm(flat_list: list[dict]) -> list[dict]:
             logger.warning("LLM ingredient normalization failed: empty or missing ingredients in response")
             return []
         canonical = out.ingredients
-        if len(canonical) != len(flat_list):
+        if len(canonical) != len(keys):
             logger.warning(
                 "LLM ingredient normalization failed: response length %s != input length %s",
                 len(canonical),
-                len(flat_list),
+                len(keys),
             )
             return []
         return [{"name": (c.name or "").strip().lower(), "unit": (c.unit or "").strip().lower() or ""} for c in canonical]
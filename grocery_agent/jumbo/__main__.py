@@ -3,27 +3,28 @@ import asyncio
 import logging
 import sys
 
-from dotenv import load_dotenv
-
 from grocery_agent.jumbo import run
 from grocery_agent.llm import get_browser_use_llm
 
-load_dotenv()
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    datefmt="%H:%M:%S",
-)
-
 
 def main():
+    # Configured here rather than at import, so importing this module leaves logging untouched
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%H:%M:%S",
+    )
     try:
         llm = get_browser_use_llm()
     except ValueError as e:
         print(e, file=sys.stderr)
         sys.exit(1)
-    asyncio.run(run(llm))
+    with asyncio.Runner() as runner:
+        # Python 3.12+: coroutines that finish without awaiting skip a trip through the scheduler
+        eager = getattr(asyncio, "eager_task_factory", None)
+        if eager is not None:
+            runner.get_loop().set_task_factory(eager)
+        runner.run(run(llm))
 
 
 if __name__ == "__main__":
@@ -1,22 +1,47 @@
-"""Jumbo agent config: site URL, credentials, browser path."""
+"""Jumbo agent config: site URL, credentials, browser path and profile."""
 import os
+from functools import cache
 from pathlib import Path
 
 SITE = "https://www.jumbo.cl"
+# Persistent Chromium profile, so the jumbo.cl session survives between runs
+DEFAULT_USER_DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "browser_profile"
 
 
+@cache
 def get_credentials() -> tuple[str, str]:
-    """Return (email, password) from env. Load .env before calling."""
+    """Return (email, password) from env. Load .env before calling (read once per process)."""
     return (
         os.environ.get("JUMBO_EMAIL", ""),
         os.environ.get("JUMBO_PASSWORD", ""),
     )
 
 
+@cache
 def get_browser_executable() -> str | None:
-    """Browser path from BROWSER_EXECUTABLE_PATH or auto-detect Chromium on macOS."""
+    """Browser path from BROWSER_EXECUTABLE_PATH or auto-detect Chromium on macOS. Resolved once per process."""
     path = os.environ.get("BROWSER_EXECUTABLE_PATH")
     if path and Path(path).exists():
         return path
     default = Path("/Applications/Chromium.app/Contents/MacOS/Chromium")
     return str(default) if default.exists() else None
+
+
+def get_concurrency() -> int:
+    """Number of items processed in parallel (one browser each) from JUMBO_CONCURRENCY; default 3."""
+    try:
+        return max(1, int(os.environ.get("JUMBO_CONCURRENCY", "3")))
+    except ValueError:
+        return 3
+
+
+def get_user_data_dir() -> str | None:
+    """
+    Profile dir for the main browser from JUMBO_USER_DATA_DIR (default data/browser_profile).
+    Set it to an empty string for a fresh throwaway profile each run.
+    """
+    path = os.environ.get("JUMBO_USER_DATA_DIR", str(DEFAULT_USER_DATA_DIR))
+    if not path:
+        return None
+    Path(path).mkdir(parents=True, exist_ok=True)
+    return path
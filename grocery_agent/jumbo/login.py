@@ -0,0 +1,82 @@
+"""Scripted jumbo.cl login: fill the form directly instead of spending LLM steps on it."""
+import asyncio
+import logging
+from pathlib import Path
+
+from browser_use import Browser
+
+from grocery_agent.jumbo.config import SITE, get_user_data_dir
+
+logger = logging.getLogger(__name__)
+
+LOGIN_URL = f"{SITE}/login"
+_EMAIL_SELECTOR = "input[type=email], input[name=email]"
+_PASSWORD_SELECTOR = "input[type=password]"
+_SUBMIT_SELECTOR = "button[type=submit]"
+_FORM_TIMEOUT = 8.0
+_SUBMIT_TIMEOUT = 10.0
+_POLL_INTERVAL = 0.5
+# Written into the persistent profile after a form login works, so a later redirect away from
+# LOGIN_URL can be trusted to mean "still logged in" rather than "wrong login URL"
+_LOGIN_MARKER = ".jumbo_form_login"
+
+
+def _login_marker() -> Path | None:
+    user_data_dir = get_user_data_dir()
+    return Path(user_data_dir) / _LOGIN_MARKER if user_data_dir else None
+
+
+async def _wait_for(page, selector: str, timeout: float, present: bool = True) -> list:
+    """Poll until selector matches (or, with present=False, stops matching); returns the last matches."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        elements = await page.get_elements_by_css_selector(selector)
+        if bool(elements) == present or loop.time() >= deadline:
+            return elements
+        await asyncio.sleep(_POLL_INTERVAL)
+
+
+async def login_with_form(browser: Browser, email: str, password: str) -> bool:
+    """
+    Log in by filling the login form at LOGIN_URL. Returns True when the password field is gone
+    after submitting, or when the site redirects away from LOGIN_URL without showing the form and
+    an earlier form login has succeeded (the marker in the persistent profile shows LOGIN_URL is
+    right, so the redirect means the session is valid). False (never raises) otherwise, so the
+    caller can fall back to the LLM login task. Also used to verify the extra browsers' sessions.
+    """
+    if not email or not password:
+        return False
+    try:
+        await browser.start()
+        page = await browser.get_current_page() or await browser.new_page()
+        await page.goto(LOGIN_URL)
+        emails = await _wait_for(page, _EMAIL_SELECTOR, _FORM_TIMEOUT)
+        passwords = await page.get_elements_by_css_selector(_PASSWORD_SELECTOR)
+        if not emails or not passwords:
+            marker = _login_marker()
+            redirected = not (await page.get_url()).startswith(LOGIN_URL)
+            if redirected and marker is not None and marker.exists():
+                logger.info("Already logged in (redirected away from the login page).")
+                return True
+            logger.info("Login form not found at %s; using the agent to log in.", LOGIN_URL)
+            return False
+        await emails[0].fill(email)
+        await passwords[0].fill(password)
+        submit = await page.get_elements_by_css_selector(_SUBMIT_SELECTOR)
+        if submit:
+            await submit[0].click()
+        else:
+            await page.press("Enter")
+        if await _wait_for(page, _PASSWORD_SELECTOR, _SUBMIT_TIMEOUT, present=False):
+            logger.info("Login form still shown after submitting; using the agent to log in.")
+            return False
+        await page.goto(SITE)
+        marker = _login_marker()
+        if marker is not None:
+            marker.touch()
+    except Exception as e:
+        logger.warning("Scripted login failed (%s); using the agent to log in.", e)
+        return False
+    logger.info("Logged in with the login form (no agent steps).")
+    return True
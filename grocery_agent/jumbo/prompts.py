@@ -2,12 +2,59 @@
 
 NON_PERISHABLE_CATEGORIES = frozenset({"pantry", "spice", "condiment"})
 
+# Static prompt text lives in module constants; builders only fill in the per-call fields
+_LOGIN_LINE = (
+    'If the site shows you are logged out or asks you to sign in, log in first: use email "{email}" and password "{password}". Then continue.'
+)
+_LOGIN_TEMPLATE = "Go to {site}.\n" + _LOGIN_LINE + "\nAfter logging in, stay on the site and wait for further instructions."
+_LOGIN_ITEM_TEMPLATE = "Go to {site}.\n" + _LOGIN_LINE + "\nThen handle this item:\n\n"
+_FALLBACK_TEMPLATE = "Go to {site}.\n" + _LOGIN_LINE + "\nSearch for papas (in Spanish) and add them to the cart. Then stop."
+
 
 def build_login_task(site: str, email: str, password: str) -> str:
     """Build the initial login task."""
-    return f"""Go to {site}.
-If the site shows you are logged out or asks you to sign in, log in first: use email "{email}" and password "{password}". Then continue.
-After logging in, stay on the site and wait for further instructions."""
+    return _LOGIN_TEMPLATE.format_map({"site": site, "email": email, "password": password})
+
+
+def build_login_item_task(site: str, email: str, password: str, item_task: str) -> str:
+    """Login followed by the first item in one task, so a single agent keeps the page state between them."""
+    return _LOGIN_ITEM_TEMPLATE.format_map({"site": site, "email": email, "password": password}) + item_task
+
+
+# Static item instructions, passed once per Agent as extend_system_message. Keeping every per-item
+# detail out of it means the system prompt is byte-identical across items, so providers can serve
+# it from their prompt cache; build_item_task() only produces the short per-item block.
+ITEM_SYSTEM_PROMPT = """You are adding grocery items to the cart on jumbo.cl. Each task describes ONE item: its name, the amount needed, the required form, and whether it is optional.
+
+IMPORTANT: The website is in Spanish. All searches and product interactions must be done in Spanish.
+
+For the item in the task:
+1. Search in Spanish using the search term given in the task
+2. Review ALL search results carefully
+3. Choose an option that matches the required form (ALWAYS take into account the form of the ingredient)
+4. When comparing multiple options that fit the form requirement, prefer the one with the better price per kg (or per unit if kg is not available)
+5. Check if this item is already in your cart. If it is, verify the quantity matches what is required; if not, update quantity or add more units.
+6. If not in cart, add the selected item to the cart. Before confirming: set the quantity (or number of units) so the TOTAL matches the amount needed (e.g. 20 cloves = add enough for 20 cloves, not just 1 or 2).
+7. Only for REQUIRED items: if you cannot find a good match for the exact item with the required form:
+   - Try searching for a similar/reasonable replacement (e.g., different brand, slightly different form, or a close substitute)
+   - The replacement should serve the same purpose in cooking (e.g., if you can't find 'fresh tomatoes', 'canned tomatoes' might work)
+   - Only use a replacement if absolutely necessary - prefer the exact item when possible
+   - Add the replacement to the cart if it's reasonable
+   OPTIONAL items can simply be skipped if you don't find a good option.
+
+As soon as the item is in the cart with the right quantity (or an optional item is skipped), call done right away. Do not keep browsing."""
+
+# Sent to an item agent that used its first step budget without calling done
+ITEM_CONTINUE_TASK = "You have not finished this item yet. Continue from where you are (check the cart first), then call done."
+
+
+_HEADER_TEMPLATE = "ITEM {item_num} of {total_items}: {name}\n\nSearch in Spanish: '{search_query}'"
+_OPTIONAL_LINE = "[OPTIONAL - you can skip if you don't find a good option]"
+_REQUIRED_LINE = "[REQUIRED - use a reasonable replacement if the exact item is not available]"
+_PANTRY_NOTE = (
+    "\nThis is a pantry staple (non-perishable). Prefer buying a larger package size when it has a better price per kg"
+    " to optimize for cost (e.g. 1 kg flour instead of 500 g if cheaper per kg)."
+)
 
 
 def build_item_task(
@@ -16,7 +63,7 @@ def build_item_task(
     total_items: int,
     non_perishable_categories: frozenset[str] | None = None,
 ) -> str:
-    """Build a focused task for a single grocery item."""
+    """Build the per-item task block; the shared steps are in ITEM_SYSTEM_PROMPT."""
     non_perishable_categories = non_perishable_categories or NON_PERISHABLE_CATEGORIES
 
     name = item.get("name", "").strip()
@@ -27,53 +74,16 @@ def build_item_task(
     category = (item.get("category") or "").strip().lower()
     search_query = name
 
-    task_parts = [
-        f"ITEM {item_num} of {total_items}: {name.upper()}",
-        "",
-        "IMPORTANT: The website is in Spanish. All searches and product interactions must be done in Spanish.",
-        "",
-    ]
-
+    lines = [_HEADER_TEMPLATE.format(item_num=item_num, total_items=total_items, name=name.upper(), search_query=search_query)]
     if amount_str:
-        task_parts.append(f"Amount needed: {amount_str}")
-    task_parts.append(f"Required form: {form} (translate to Spanish when searching)")
-    if optional:
-        task_parts.append("[OPTIONAL - you can skip if you don't find a good option]")
-
+        lines.append(f"Amount needed: {amount_str}")
+    lines.append(f"Required form: {form} (translate to Spanish when searching)")
+    lines.append(_OPTIONAL_LINE if optional else _REQUIRED_LINE)
     if pantry_item and category in non_perishable_categories:
-        task_parts.append("")
-        task_parts.append("This is a pantry staple (non-perishable). Prefer buying a larger package size when it has a better price per kg to optimize for cost (e.g. 1 kg flour instead of 500 g if cheaper per kg).")
-
-    task_parts.extend([
-        "",
-        f"1. Search in Spanish: '{search_query}'",
-        "2. Review ALL search results carefully",
-        f"3. Choose an option that matches the form '{form}' (ALWAYS take into account the form of the ingredient)",
-        "4. When comparing multiple options that fit the form requirement, prefer the one with the better price per kg (or per unit if kg is not available)",
-        "5. Check if this item is already in your cart. If it is, verify the quantity matches what is required; if not, update quantity or add more units.",
-        "6. If not in cart, add the selected item to the cart. Before confirming: set the quantity (or number of units) so the TOTAL matches the QUANTITY REQUIRED above (e.g. 20 cloves = add enough for 20 cloves, not just 1 or 2).",
-    ])
-
-    if not optional:
-        task_parts.extend([
-            "",
-            "7. If you cannot find a good match for the exact item with the required form:",
-            "   - Try searching for a similar/reasonable replacement (e.g., different brand, slightly different form, or a close substitute)",
-            "   - The replacement should serve the same purpose in cooking (e.g., if you can't find 'fresh tomatoes', 'canned tomatoes' might work)",
-            "   - Only use a replacement if absolutely necessary - prefer the exact item when possible",
-            "   - Add the replacement to the cart if it's reasonable",
-        ])
-
-    task_parts.extend([
-        "",
-        "After completing this item, stop and wait for the next instruction.",
-    ])
-
-    return "\n".join(task_parts)
+        lines.append(_PANTRY_NOTE)
+    return "\n".join(lines)
 
 
 def build_fallback_task(site: str, email: str, password: str) -> str:
     """Build fallback task when no grocery list is present."""
-    return f"""Go to {site}.
-If the site shows you are logged out or asks you to sign in, log in first: use email "{email}" and password "{password}". Then continue.
-Search for papas (in Spanish) and add them to the cart. Then stop."""
+    return _FALLBACK_TEMPLATE.format_map({"site": site, "email": email, "password": password})
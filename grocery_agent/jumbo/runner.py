@@ -1,34 +1,248 @@
 """Run the Jumbo browser agent: login, then process grocery list or fallback."""
+import asyncio
+import copy
+import json
 import logging
+import math
+import tempfile
+import time
+from pathlib import Path
 
 from browser_use import Agent, Browser
+from browser_use.agent.views import AgentHistoryList
 
 from grocery_agent.grocery_list import load_grocery_list
-from grocery_agent.jumbo.config import SITE, get_browser_executable, get_credentials
+from grocery_agent.jumbo.config import (
+    SITE,
+    get_browser_executable,
+    get_concurrency,
+    get_credentials,
+    get_user_data_dir,
+)
+from grocery_agent.jumbo.login import login_with_form
 from grocery_agent.jumbo.prompts import (
+    ITEM_CONTINUE_TASK,
+    ITEM_SYSTEM_PROMPT,
     NON_PERISHABLE_CATEGORIES,
     build_fallback_task,
     build_item_task,
+    build_login_item_task,
     build_login_task,
 )
 
 logger = logging.getLogger(__name__)
 
 MAX_STEPS_LOGIN = 15
-MAX_STEPS_ITEM = 20
+MAX_STEPS_ITEM = 10  # most items finish well within this; unfinished ones get extended once
+MAX_STEPS_ITEM_EXTENDED = 20
 MAX_STEPS_FALLBACK = 20
 
+# Steps used by recent item agents; the first-run budget is tightened to their p95 + margin
+STEP_STATS_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "step_stats.json"
+_STEP_STATS_MAX = 200
+_STEP_STATS_MIN_SAMPLES = 20
+_STEP_BUDGET_MARGIN = 2
+_STEP_BUDGET_FLOOR = 5
+
+
+def _load_step_counts() -> list[int]:
+    try:
+        data = json.loads(STEP_STATS_PATH.read_text(encoding="utf-8"))
+        return [int(n) for n in data.get("item_steps", [])]
+    except (OSError, ValueError, TypeError, AttributeError):
+        return []
+
+
+def _save_step_counts(new: list[int]) -> None:
+    """Append this run's item step counts, keeping the most recent _STEP_STATS_MAX."""
+    if not new:
+        return
+    counts = (_load_step_counts() + new)[-_STEP_STATS_MAX:]
+    try:
+        STEP_STATS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        STEP_STATS_PATH.write_text(json.dumps({"item_steps": counts}), encoding="utf-8")
+    except OSError as e:
+        logger.warning("Could not write step stats: %s", e)
+
+
+def _item_step_budget() -> int:
+    """First-run step budget for an item: p95 of recorded counts + margin, capped at MAX_STEPS_ITEM."""
+    counts = sorted(_load_step_counts())
+    if len(counts) < _STEP_STATS_MIN_SAMPLES:
+        return MAX_STEPS_ITEM
+    p95 = counts[math.ceil(len(counts) * 0.95) - 1]  # nearest-rank
+    return min(MAX_STEPS_ITEM, max(_STEP_BUDGET_FLOOR, p95 + _STEP_BUDGET_MARGIN))
+
+
+# One JSON line per agent: prompt, cached-prompt and completion tokens, to catch prompt-cache regressions
+TOKEN_USAGE_PATH = STEP_STATS_PATH.parent / "token_usage.jsonl"
+
 
-def _make_browser():
+def _agent_llm(llm):
+    """
+    Shallow copy of llm for one Agent. Each Agent's token accounting wraps its llm's ainvoke in
+    place, so agents sharing one instance would each count every call (concurrent items included).
+    The copy keeps the shared config and client but gets its own wrapper, so history.usage is
+    per agent and summing it across agents counts each call once.
+    """
+    clone = copy.copy(llm)
+    # Drop a wrapper an earlier Agent may have put on the caller's instance
+    getattr(clone, "__dict__", {}).pop("ainvoke", None)
+    return clone
+
+
+def _usage_entry(label: str, history: AgentHistoryList | None) -> dict | None:
+    """Log one agent's token usage with its prompt-cache hit ratio; None if there is no usage."""
+    usage = history.usage if history is not None else None
+    if usage is None or not usage.total_prompt_tokens:
+        return None
+    prompt, cached = usage.total_prompt_tokens, usage.total_prompt_cached_tokens
+    ratio = cached / prompt
+    logger.info("%s tokens: prompt=%d cached=%d (cache_hit_ratio=%.2f)", label, prompt, cached, ratio)
+    return {
+        "agent": label,
+        "prompt_tokens": prompt,
+        "cached_tokens": cached,
+        "completion_tokens": usage.total_completion_tokens,
+    }
+
+
+def _save_token_usage(entries: list[dict | None]) -> None:
+    """Log this run's overall cache hit ratio and append its entries to TOKEN_USAGE_PATH."""
+    entries = [e for e in entries if e is not None]
+    if not entries:
+        return
+    prompt = sum(e["prompt_tokens"] for e in entries)
+    cached = sum(e["cached_tokens"] for e in entries)
+    logger.info("Run tokens: prompt=%d cached=%d (cache_hit_ratio=%.2f)", prompt, cached, cached / prompt)
+    ts = int(time.time())
+    try:
+        TOKEN_USAGE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with TOKEN_USAGE_PATH.open("a", encoding="utf-8") as f:
+            f.writelines(json.dumps({"ts": ts, **e}) + "\n" for e in entries)
+    except OSError as e:
+        logger.warning("Could not write token usage: %s", e)
+
+
+def _make_browser(storage_state: Path | None = None):
+    """Main browser (storage_state=None) uses the persistent profile; extra ones load a session file."""
     kwargs = {"headless": False, "keep_alive": True}
     path = get_browser_executable()
     if path:
         kwargs["executable_path"] = path
+    if storage_state is not None:
+        # Chromium locks a profile dir to one process, so extra browsers run on throwaway profiles.
+        # Must be a file path: browser_use 0.11 silently ignores a storage_state dict.
+        kwargs["storage_state"] = str(storage_state)
+    else:
+        user_data_dir = get_user_data_dir()
+        if user_data_dir:
+            kwargs["user_data_dir"] = user_data_dir
     return Browser(**kwargs)
 
 
+async def _extra_browsers(
+    browser: Browser, count: int, state_dir: Path, email: str, password: str
+) -> list[Browser]:
+    """
+    Open up to `count` more browsers on the logged-in session, each loading its own copy of the
+    exported cookies from a file in state_dir. Only browsers that login_with_form confirms as logged
+    in are returned; an unverified one would add its items to an anonymous guest cart. Empty list
+    (items then run one at a time on the main browser) if export fails or none can be verified.
+    """
+    if count <= 0:
+        return []
+    try:
+        state = json.dumps(await browser.export_storage_state())
+        paths = [state_dir / f"session_{n}.json" for n in range(count)]
+        for path in paths:  # one file each: browser_use writes cookie changes back to it
+            path.write_text(state, encoding="utf-8")
+    except Exception as e:
+        logger.warning("Could not export login session (%s); processing items one at a time.", e)
+        return []
+    extra = [_make_browser(storage_state=path) for path in paths]
+    verified = await asyncio.gather(*(login_with_form(b, email, password) for b in extra))
+    ready = [b for b, ok in zip(extra, verified) if ok]
+    for b, ok in zip(extra, verified):
+        if not ok:
+            await _kill_browser(b)
+    if len(ready) < count:
+        logger.warning(
+            "%d of %d extra browsers not confirmed logged in; running %d item(s) at a time.",
+            count - len(ready),
+            count,
+            len(ready) + 1,
+        )
+    return ready
+
+
+async def _kill_browser(browser: Browser) -> None:
+    try:
+        await browser.kill()
+    except Exception as e:
+        logger.debug("Error closing extra browser: %s", e)
+
+
+async def _process_item(
+    llm,
+    browsers: asyncio.Queue,
+    item: dict,
+    i: int,
+    total: int,
+    max_steps: int = MAX_STEPS_ITEM,
+    login: tuple[str, str] | None = None,
+) -> AgentHistoryList | None:
+    """
+    Run the item agent on the next free browser; errors are logged, not raised.
+    With login=(email, password) the same agent logs in first and gets the login step budget on top.
+    Returns the agent's history, or None on error.
+    """
+    browser = await browsers.get()
+    try:
+        logger.info("")
+        logger.info("=" * 60)
+        logger.info("STEP %d/%d: Processing %s", i, total, item.get("name", "").upper())
+        logger.info("=" * 60)
+
+        task = build_item_task(item, i, total, NON_PERISHABLE_CATEGORIES)
+        extra_steps = 0
+        if login is not None:
+            task = build_login_item_task(SITE, *login, task)
+            extra_steps = MAX_STEPS_LOGIN
+        # Full prompts (which include credentials on the login step) only at DEBUG; %s args keep it lazy
+        logger.debug("Item task:\n%s", task)
+        logger.info("Item %d/%d task: %d chars", i, total, len(task))
+
+        try:
+            # Inside the try: a failing constructor must not escape into the TaskGroup and cancel other items
+            agent = Agent(
+                task=task,
+                llm=_agent_llm(llm),
+                browser=browser,
+                use_vision=False,
+                extend_system_message=ITEM_SYSTEM_PROMPT,
+            )
+            steps, extended = max_steps + extra_steps, MAX_STEPS_ITEM_EXTENDED + extra_steps
+            history = await agent.run(max_steps=steps)
+            if not history.is_done():
+                # Same agent, so page state and what it already tried carry over
+                logger.info("Item %d not finished in %d steps; continuing up to %d", i, steps, extended)
+                agent.add_new_task(ITEM_CONTINUE_TASK)
+                history = await agent.run(max_steps=extended)
+            return history
+        except Exception as e:
+            logger.error("Error processing item %d (%s): %s", i, item.get("name"), e)
+            if item.get("optional"):
+                logger.info("Item is optional, continuing to next item...")
+            else:
+                logger.warning("Item is required, but continuing anyway. Check manually.")
+            return None
+    finally:
+        browsers.put_nowait(browser)
+
+
 def _log_item(i: int, item: dict) -> None:
-    logger.info(
+    logger.debug(
         "  %d. %s %s (%s)%s",
         i,
         item.get("amount_str", ""),
@@ -41,7 +255,7 @@ def _log_item(i: int, item: dict) -> None:
 async def run(llm, browser: Browser | None = None):
     """
     Load grocery list, run login, then process each item (or fallback).
-    Uses use_vision=False. Caller must load_dotenv() and set up logging/LLM.
+    Uses use_vision=False. Caller sets up logging/LLM (.env is loaded on import of grocery_agent).
     """
     items = load_grocery_list()
     email, password = get_credentials()
@@ -51,44 +265,65 @@ async def run(llm, browser: Browser | None = None):
         logger.info("Using fallback task: search for papas")
 
     if items:
-        logger.info("Grocery list (%d items):", len(items))
-        for i, item in enumerate(items, 1):
-            _log_item(i, item)
+        logger.info("Grocery list: %d items", len(items))
+        # Each item is logged again when it is processed; the full listing is only for DEBUG runs
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, item in enumerate(items, 1):
+                _log_item(i, item)
 
     if browser is None:
         browser = _make_browser()
 
-    # Login
-    logger.info("=" * 60)
-    logger.info("STEP 1: Login/Verify session")
-    logger.info("=" * 60)
-    login_task = build_login_task(SITE, email, password)
-    logger.info("Login task:\n%s", login_task)
+    total = len(items) if items else 0
+    workers = min(get_concurrency(), total)
+
+    # Login: fill the form directly; only if that fails does an agent do it. With a single worker
+    # the agent login is folded into the first item's agent instead (no context reload between
+    # them); with several, the session must exist first so it can be shared.
+    logged_in = await login_with_form(browser, email, password)
+    usage: list[dict | None] = []
+    if not logged_in and workers != 1:
+        logger.info("=" * 60)
+        logger.info("STEP 1: Login/Verify session")
+        logger.info("=" * 60)
+        login_task = build_login_task(SITE, email, password)
+        logger.debug("Login task:\n%s", login_task)
 
-    agent = Agent(task=login_task, llm=llm, browser=browser, use_vision=False)
-    await agent.run(max_steps=MAX_STEPS_LOGIN)
+        agent = Agent(task=login_task, llm=_agent_llm(llm), browser=browser, use_vision=False)
+        usage.append(_usage_entry("Login", await agent.run(max_steps=MAX_STEPS_LOGIN)))
 
-    # Items or fallback
+    # Items or fallback: up to JUMBO_CONCURRENCY items at once, each on its own logged-in browser
     if items:
-        total = len(items)
-        for i, item in enumerate(items, 1):
-            logger.info("")
-            logger.info("=" * 60)
-            logger.info("STEP %d/%d: Processing %s", i, total, item.get("name", "").upper())
-            logger.info("=" * 60)
-
-            task = build_item_task(item, i, total, NON_PERISHABLE_CATEGORIES)
-            logger.info("Item task:\n%s", task)
-
-            agent = Agent(task=task, llm=llm, browser=browser, use_vision=False)
-            try:
-                await agent.run(max_steps=MAX_STEPS_ITEM)
-            except Exception as e:
-                logger.error("Error processing item %d (%s): %s", i, item.get("name"), e)
-                if item.get("optional"):
-                    logger.info("Item is optional, continuing to next item...")
-                else:
-                    logger.warning("Item is required, but continuing anyway. Check manually.")
+        state_dir = tempfile.TemporaryDirectory(prefix="jumbo-session-")
+        extra = await _extra_browsers(browser, workers - 1, Path(state_dir.name), email, password)
+        browsers: asyncio.Queue = asyncio.Queue()
+        for b in [browser, *extra]:
+            browsers.put_nowait(b)
+        max_steps = _item_step_budget()
+        if max_steps < MAX_STEPS_ITEM:
+            logger.info(
+                "Item step budget: %d (p95 of recent runs), extended up to %d",
+                max_steps,
+                MAX_STEPS_ITEM_EXTENDED,
+            )
+        fused_login = workers == 1 and not logged_in
+        tasks = []
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for i, item in enumerate(items, 1):
+                    login = (email, password) if fused_login and i == 1 else None
+                    task = _process_item(llm, browsers, item, i, total, max_steps, login)
+                    tasks.append(tg.create_task(task))
+            histories = [t.result() for t in tasks]
+            # A folded-in login would inflate the first item's count
+            counted = histories[1:] if fused_login else histories
+            _save_step_counts([h.number_of_steps() for h in counted if h is not None])
+            usage += [_usage_entry(f"Item {i}", h) for i, h in enumerate(histories, 1)]
+        finally:
+            # The caller's browser stays open (keep_alive) for checkout; the extra ones are closed
+            for b in extra:
+                await _kill_browser(b)
+            state_dir.cleanup()
 
         logger.info("")
         logger.info("=" * 60)
@@ -96,6 +331,7 @@ async def run(llm, browser: Browser | None = None):
         logger.info("=" * 60)
     else:
         fallback_task = build_fallback_task(SITE, email, password)
-        logger.info("Fallback task:\n%s", fallback_task)
-        agent = Agent(task=fallback_task, llm=llm, browser=browser, use_vision=False)
-        await agent.run(max_steps=MAX_STEPS_FALLBACK)
+        logger.debug("Fallback task:\n%s", fallback_task)
+        agent = Agent(task=fallback_task, llm=_agent_llm(llm), browser=browser, use_vision=False)
+        usage.append(_usage_entry("Fallback", await agent.run(max_steps=MAX_STEPS_FALLBACK)))
+    _save_token_usage(usage)
@@ -8,16 +8,36 @@ LLM resolution from env. Two use cases:
   Uses Google (Gemini), which supports arbitrary Pydantic models. Requires GOOGLE_API_KEY.
 
 - get_llm(): alias for get_generic_llm() for backward compatibility.
+
+Clients are memoized per configuration, so repeated calls (one per web request) share one client
+and its connection pool. Env vars are still checked on every call; reset_llm_cache() drops the clients.
 """
 import os
+from functools import lru_cache
 
 from browser_use import ChatBrowserUse, ChatGoogle
 
 
+@lru_cache(maxsize=1)
+def _browser_use_client() -> ChatBrowserUse:
+    return ChatBrowserUse()
+
+
+@lru_cache(maxsize=4)
+def _google_client(model: str) -> ChatGoogle:
+    return ChatGoogle(model=model)
+
+
+def reset_llm_cache() -> None:
+    """Forget memoized clients (e.g. after changing API keys or GEMINI_MODEL)."""
+    _browser_use_client.cache_clear()
+    _google_client.cache_clear()
+
+
 def get_browser_use_llm():
     """Return an LLM for browser automation (run_jumbo). Prefers Browser-Use API; falls back to Google if only GOOGLE_API_KEY is set."""
     if os.environ.get("BROWSER_USE_API_KEY"):
-        return ChatBrowserUse()
+        return _browser_use_client()
     return get_generic_llm()
 
 
@@ -32,7 +52,7 @@ def get_generic_llm():
             "Get a key at https://aistudio.google.com/app/apikey"
         )
     model = os.environ.get("GEMINI_MODEL", "gemini-flash-latest")
-    return ChatGoogle(model=model)
+    return _google_client(model)
 
 
 def get_llm():
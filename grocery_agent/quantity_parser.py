@@ -2,6 +2,7 @@
 Deterministic parsing of quantity strings to float.
 Handles simple fractions and decimals; returns None for "to taste", "pinch", etc.
 """
+import math
 import re
 from fractions import Fraction
 from typing import Optional
@@ -12,6 +13,18 @@ QUALITATIVE_UNITS = frozenset(
 )
 
 
+# Unicode and common ASCII fractions -> value (one dict lookup instead of an if-chain)
+_FRAC_MAP = {
+    "½": 0.5, "1/2": 0.5,
+    "⅓": 1 / 3, "1/3": 1 / 3,
+    "⅔": 2 / 3, "2/3": 2 / 3,
+    "¼": 0.25, "1/4": 0.25,
+    "¾": 0.75, "3/4": 0.75,
+}
+_FRAC_RE = re.compile(r"^\d+/\d+$")
+_NUM_PREFIX_RE = re.compile(r"^([\d./\s½⅓⅔¼¾]+)")
+
+
 def parse_quantity(value: Optional[str]) -> Optional[float]:
     """
     Parse a quantity string to a float. Returns None for qualitative amounts.
@@ -29,37 +42,36 @@ def parse_quantity(value: Optional[str]) -> Optional[float]:
     if len(parts) == 2 and parts[0].isdigit():
         try:
             whole = int(parts[0])
-            frac_val = parse_quantity(parts[1])
+            frac_val = None if parts[1] in QUALITATIVE_UNITS else _parse_single(parts[1])
             if frac_val is not None and 0 < frac_val < 1:
                 return whole + frac_val
-        except (ValueError, TypeError):
+        except (ValueError, TypeError, OverflowError):  # OverflowError: whole too large for a float
             pass
-    # Simple fraction: "1/2", "½"
-    if s in ("½", "1/2"):
-        return 0.5
-    if s in ("⅓", "1/3"):
-        return 1 / 3
-    if s in ("⅔", "2/3"):
-        return 2 / 3
-    if s in ("¼", "1/4"):
-        return 0.25
-    if s in ("¾", "3/4"):
-        return 0.75
-    if re.match(r"^\d+/\d+$", s):
+    return _parse_single(s)
+
+
+def _parse_single(s: str) -> Optional[float]:
+    """Fraction, decimal or leading-number parse of a stripped, lowercased, non-qualitative string."""
+    frac = _FRAC_MAP.get(s)
+    if frac is not None:
+        return frac
+    if _FRAC_RE.match(s):
         try:
             return float(Fraction(s))
-        except (ValueError, ZeroDivisionError):
+        except (ValueError, ZeroDivisionError, OverflowError):
             return None
-    # Decimal or integer: "2", "1.5"
+    # Decimal or integer: "2", "1.5". float() also accepts "inf"/"nan"/"1e999": no usable amount
     try:
-        return float(s)
+        num = float(s)
+        return num if math.isfinite(num) else None
     except ValueError:
         pass
     # Strip trailing unit words and try again: "2 cups" -> we only parse "2" here; caller passes "2 cups", we might get "2" or "2 cups". For now we expect LLM to give quantity and unit separately. If we get "2 cups" in quantity we could try to parse "2" - strip non-numeric suffix.
-    num_part = re.match(r"^([\d./\s½⅓⅔¼¾]+)", s)
+    num_part = _NUM_PREFIX_RE.match(s)
     if num_part:
         try:
-            return float(Fraction(num_part.group(1).strip()))
-        except (ValueError, ZeroDivisionError):
+            num = float(Fraction(num_part.group(1).strip()))
+            return num if math.isfinite(num) else None
+        except (ValueError, ZeroDivisionError, OverflowError):
             pass
     return None
@@ -1,11 +1,24 @@
 """
 Recipe parsing: one LLM call to turn recipe text into a structured Recipe.
+Results are cached in the llm_cache table for 24 h, so re-ingesting the same text skips the LLM.
 """
+import asyncio
+import hashlib
+import logging
+import sqlite3
+
 from browser_use.llm.messages import SystemMessage, UserMessage
+from pydantic import BaseModel, Field, ValidationError
 
+from grocery_agent.batch_llm import RequestBatcher
+from grocery_agent.db import get_cached_llm_response, get_connection, put_cached_llm_response
 from grocery_agent.llm import get_generic_llm
 from grocery_agent.models import Recipe
 
+logger = logging.getLogger(__name__)
+
+PARSE_CACHE_TTL_HOURS = 24
+
 SYSTEM_PROMPT = """You extract a recipe from the given text and return it as a structured Recipe.
 
 IMPORTANT: If the recipe text is in a language other than English, translate everything to English first, then extract the recipe structure. All output (name, ingredients, instructions) must be in English.
@@ -32,14 +45,89 @@ Rules:
 - source_url: Leave null unless the text explicitly states a URL or you are given a URL."""
 
 
-async def parse_recipe(text: str) -> Recipe:
-    """Turn recipe text into a structured Recipe via one LLM call (structured output)."""
-    if not text or not text.strip():
-        raise ValueError("Recipe text is empty")
-    llm = get_generic_llm()
+BATCH_PROMPT_SUFFIX = """
+
+You may be given several recipes at once, each starting with a line "=== RECIPE n ===".
+Extract each one independently and return them in "recipes" in the same order, one per input."""
+
+
+class RecipeBatch(BaseModel):
+    """Structured output for a batched parse: one Recipe per input, in order."""
+    recipes: list[Recipe] = Field(..., description="One recipe per input recipe, same order as the input")
+
+
+async def _llm_parse_one(llm, text: str) -> Recipe:
     messages = [
-        SystemMessage(content=SYSTEM_PROMPT),
-        UserMessage(content=text.strip()),
+        SystemMessage(content=SYSTEM_PROMPT, cache=True),
+        UserMessage(content=text),
     ]
     result = await llm.ainvoke(messages, output_format=Recipe)
     return result.completion
+
+
+async def _llm_parse_batch(texts: list[str]) -> list[Recipe | BaseException]:
+    """One LLM call for all texts; falls back to one call per text if the batch answer doesn't line up."""
+    llm = get_generic_llm()
+    if len(texts) == 1:
+        return [await _llm_parse_one(llm, texts[0])]
+    user_content = "\n\n".join(f"=== RECIPE {i} ===\n{t}" for i, t in enumerate(texts, 1))
+    messages = [
+        SystemMessage(content=SYSTEM_PROMPT + BATCH_PROMPT_SUFFIX, cache=True),
+        UserMessage(content=user_content),
+    ]
+    try:
+        result = await llm.ainvoke(messages, output_format=RecipeBatch)
+        recipes = result.completion.recipes
+        if len(recipes) == len(texts):
+            return list(recipes)
+        logger.warning("Batched recipe parse returned %d recipes for %d inputs; parsing one by one", len(recipes), len(texts))
+    except Exception as e:
+        logger.warning("Batched recipe parse failed (%s); parsing one by one", e)
+    return await asyncio.gather(*(_llm_parse_one(llm, t) for t in texts), return_exceptions=True)
+
+
+# Concurrent ingests (several tabs / users) share LLM calls: up to 8 recipes per call
+_batcher: RequestBatcher[str, Recipe] = RequestBatcher(_llm_parse_batch, max_batch=8)
+
+
+def _cache_get(key: str) -> str | None:
+    """Cached response JSON for key, or None. Blocking; called via asyncio.to_thread."""
+    try:
+        return get_cached_llm_response(get_connection(), key, PARSE_CACHE_TTL_HOURS)
+    except sqlite3.Error as e:
+        logger.warning("Recipe cache lookup failed: %s", e)
+        return None
+
+
+def _cache_put(key: str, model: str, response: str) -> None:
+    """Store response JSON under key. Blocking; called via asyncio.to_thread."""
+    try:
+        put_cached_llm_response(get_connection(), key, model, response, PARSE_CACHE_TTL_HOURS)
+    except sqlite3.Error as e:
+        logger.warning("Recipe cache write failed: %s", e)
+
+
+async def parse_recipe(text: str) -> Recipe:
+    """
+    Turn recipe text into a structured Recipe via the LLM (structured output).
+    Served from the cache when possible; concurrent calls are batched into one LLM request.
+    """
+    if not text or not text.strip():
+        raise ValueError("Recipe text is empty")
+    text = text.strip()
+    llm = get_generic_llm()
+    model = str(getattr(llm, "model", ""))
+    # Prompt is part of the key so editing SYSTEM_PROMPT invalidates old entries
+    key = hashlib.sha256("\0".join((model, SYSTEM_PROMPT, text)).encode()).hexdigest()
+    # SQLite calls go to a worker thread so a locked database (busy_timeout) never stalls the loop
+    cached = await asyncio.to_thread(_cache_get, key)
+    if cached is not None:
+        try:
+            return Recipe.model_validate_json(cached)
+        except ValidationError as e:
+            # Unreadable or written for an older Recipe schema: parse again and overwrite it
+            logger.warning("Ignoring unreadable cached recipe: %s", e)
+
+    recipe = await _batcher.submit(text)
+    await asyncio.to_thread(_cache_put, key, model, recipe.model_dump_json())
+    return recipe
@@ -1,38 +1,168 @@
 """
 Small web UI: paste recipe or URL → LLM → save to SQLite → show recipe.
 """
+import asyncio
+import itertools
+import logging
 import subprocess
 import sys
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import urlencode
 
 from fastapi import FastAPI, Form, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 
 import httpx
 
 from grocery_agent.aggregate import flat_ingredients, merge_flat_ingredients
 from grocery_agent.db import (
+    close_all,
     delete_recipe,
     get_connection,
     init_db,
     insert_recipe,
     list_recipes,
     recipe_from_row,
+    recipes_from_ids,
     replace_recipe_ingredients,
     update_recipe,
 )
-from grocery_agent.fetch import fetch_recipe_image_url, fetch_recipe_text
+from grocery_agent.fetch import aclose_client, fetch_recipe_image_url, fetch_recipe_text
+from grocery_agent.grocery_list import get_grocery_list, write_grocery_list
 from grocery_agent.ingredient_normalizer import normalize_ingredients_with_llm
 from grocery_agent.models import Recipe
 from grocery_agent.recipe import parse_recipe
 
+try:
+    import orjson  # optional: faster JSON bodies for /api/grocery-list
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
 # Init DB on startup (creates data/grocery.db and tables if missing)
 init_db()
 
-app = FastAPI(title="Grocery Agent")
-TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """Use eager tasks where available (Python 3.12+) and preload templates; release the shared HTTP client and DB connections on shutdown."""
+    eager = getattr(asyncio, "eager_task_factory", None)
+    if eager is not None:
+        asyncio.get_running_loop().set_task_factory(eager)
+    # Load every template now so the first request of each page doesn't pay for compilation
+    for name in templates.env.list_templates(extensions=["html"]):
+        templates.get_template(name)
+    yield
+    await aclose_client()
+    close_all()
+
+
+app = FastAPI(title="Grocery Agent", lifespan=_lifespan)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = PROJECT_ROOT / "grocery_agent" / "templates"
+# Compiled template bytecode, reused across restarts (and across --reload cycles)
+JINJA_CACHE_DIR = PROJECT_ROOT / "data" / "jinja_cache"
+# How list_confirm starts the jumbo bot (working directory = project root, so .env and data/ resolve)
+_JUMBO_CMD = (sys.executable, "-m", "grocery_agent.jumbo")
+JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+templates.env.bytecode_cache = FileSystemBytecodeCache(directory=str(JINJA_CACHE_DIR))
+
+
+def _start_image_fetch(url: str) -> asyncio.Task:
+    """Start looking up the page's image URL; it runs while the text is fetched and parsed by the LLM."""
+    return asyncio.create_task(fetch_recipe_image_url(url))
+
+
+async def _image_url_or_none(task: asyncio.Task) -> str | None:
+    """Result of _start_image_fetch; a failed lookup just means no image."""
+    try:
+        return await task
+    except Exception:
+        return None
+
+
+def _load_recipes() -> list:
+    """All recipes for the home list. Blocking: async handlers call it via asyncio.to_thread."""
+    conn = get_connection()
+    try:
+        return list_recipes(conn)
+    finally:
+        conn.close()
+
+
+def _load_recipes_by_id(recipe_ids: list[int]) -> dict[int, Recipe]:
+    """recipes_from_ids on this thread's connection. Blocking: call via asyncio.to_thread."""
+    conn = get_connection()
+    try:
+        return recipes_from_ids(conn, recipe_ids)
+    finally:
+        conn.close()
+
+
+def _save_new_recipe(recipe: Recipe) -> int:
+    """Insert and commit a parsed recipe; returns its id. Blocking: call via asyncio.to_thread."""
+    conn = get_connection()
+    try:
+        recipe_id = insert_recipe(conn, recipe)
+        conn.commit()
+    finally:
+        conn.close()
+    _recipes_changed()
+    return recipe_id
+
+
+def _parse_ids(ids: str) -> list[int]:
+    """Recipe ids from "1,2,3" (query or hidden form field); blank and non-numeric entries are skipped."""
+    return [int(t) for t in ids.split(",") if t.strip().isdecimal()]
+
+
+def _parse_portion(raw) -> int | None:
+    """Portions from a form/query value: a number, rounded down, at least 1. None if empty or invalid."""
+    if raw is None:
+        return None
+    text = str(raw).strip()
+    if not text:
+        return None
+    try:
+        return max(1, int(float(text)))
+    except (ValueError, OverflowError):
+        return None
+
+
+def _parse_portions(params, recipe_ids: list[int]) -> dict[int, int]:
+    """{recipe_id: portions} from portion_<id> keys in a query/form mapping, for the given ids only (one pass)."""
+    wanted = set(recipe_ids)
+    portions = {}
+    for key, raw in params.items():
+        if not key.startswith("portion_"):
+            continue
+        try:
+            rid = int(key[8:])
+        except ValueError:
+            continue
+        if rid in wanted and (p := _parse_portion(raw)) is not None:
+            portions[rid] = p
+    return portions
+
+
+async def _home_error(request: Request, error: str) -> HTMLResponse:
+    """Home page with an error message, for async handlers (loads the recipe list off the event loop)."""
+    recipes = await asyncio.to_thread(_load_recipes)
+    return _home_response(request, recipes, error)
+
+
+def _json_response(content: dict) -> Response:
+    """JSON response for plain dicts/lists, skipping jsonable_encoder; orjson when installed."""
+    if orjson is not None:
+        return Response(orjson.dumps(content), media_type="application/json")
+    return JSONResponse(content)
 
 
 def _home_response(
@@ -48,18 +178,53 @@ def _home_response(
     )
 
 
+# Recipe pages change only through this app's write routes: a counter bumped on each write plus a
+# per-process id (restarts may ship new templates) make a validator without a DB timestamp column.
+_BOOT_ID = f"{time.time_ns():x}"
+_data_versions = itertools.count(1)
+_data_version = 0
+
+
+def _recipes_changed() -> None:
+    """Call after committing a recipe insert/update/delete: drops cached recipe views, changes page ETags."""
+    global _data_version
+    _data_version = next(_data_versions)
+    _cached_recipe_view.cache_clear()
+
+
+def _page_etag(request: Request, version: int) -> tuple[str | None, bool]:
+    """
+    (ETag for a recipe-backed page, whether the client already has it). version must be the
+    _data_version the page's data is read or cached under, so the tag never claims newer data than
+    the page holds. No ETag while templates auto-reload (uv run start), since an edited template
+    would not change it.
+    """
+    if templates.env.auto_reload:
+        return None, False
+    etag = f'W/"{_BOOT_ID}-{version}"'
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag, if_none_match == "*" or etag in (t.strip() for t in if_none_match.split(","))
+
+
+def _with_etag(response: Response, etag: str | None) -> Response:
+    if etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"  # always revalidate
+    return response
+
+
 @app.get("/", response_class=HTMLResponse)
-async def home(request: Request, new_id: int | None = None):
+def home(request: Request, new_id: int | None = None):
     """Single home: pick recipes for the week, or add a new one (link/text). new_id pre-selects that recipe."""
-    conn = get_connection()
-    try:
-        recipes = list_recipes(conn)
-    finally:
-        conn.close()
-    return templates.TemplateResponse(
+    # Read before loading: if a write lands in between, the page is newer than its tag (safe direction)
+    etag, fresh = _page_etag(request, _data_version)
+    if fresh:
+        return _with_etag(Response(status_code=304), etag)
+    response = templates.TemplateResponse(
         "home.html",
-        {"request": request, "recipes": recipes, "new_id": new_id},
+        {"request": request, "recipes": _load_recipes(), "new_id": new_id},
     )
+    return _with_etag(response, etag)
 
 
 @app.get("/list", response_class=HTMLResponse)
@@ -86,116 +251,116 @@ async def list_submit(
     else:
         ids = []
     if url and url.strip():
+        image_task = _start_image_fetch(url.strip())
         try:
-            recipe_text = await fetch_recipe_text(url.strip())
-        except Exception:
-            conn = get_connection()
             try:
-                recipes = list_recipes(conn)
-            finally:
-                conn.close()
-            return _home_response(request, recipes, "Could not fetch URL. Try pasting text.")
-        try:
-            recipe = await parse_recipe(recipe_text)
-        except ValueError as e:
-            conn = get_connection()
-            recipes = list_recipes(conn)
-            conn.close()
-            return _home_response(request, recipes, str(e))
-        recipe.source_url = url.strip()
-        recipe.image_url = await fetch_recipe_image_url(url.strip())
-        conn = get_connection()
-        try:
-            new_id = insert_recipe(conn, recipe)
-            conn.commit()
-            ids.append(new_id)
+                recipe_text = await fetch_recipe_text(url.strip())
+            except Exception:
+                return await _home_error(request, "Could not fetch URL. Try pasting text.")
+            try:
+                recipe = await parse_recipe(recipe_text)
+            except ValueError as e:
+                return await _home_error(request, str(e))
+            recipe.source_url = url.strip()
+            recipe.image_url = await _image_url_or_none(image_task)
         finally:
-            conn.close()
+            image_task.cancel()  # no-op once awaited; stops the lookup on any early exit or error
+        ids.append(await asyncio.to_thread(_save_new_recipe, recipe))
     elif text and text.strip():
         try:
             recipe = await parse_recipe(text.strip())
         except ValueError as e:
-            conn = get_connection()
-            recipes = list_recipes(conn)
-            conn.close()
-            return _home_response(request, recipes, str(e))
-        conn = get_connection()
-        try:
-            new_id = insert_recipe(conn, recipe)
-            conn.commit()
-            ids.append(new_id)
-        finally:
-            conn.close()
+            return await _home_error(request, str(e))
+        ids.append(await asyncio.to_thread(_save_new_recipe, recipe))
     if not ids:
-        conn = get_connection()
-        try:
-            recipes = list_recipes(conn)
-        finally:
-            conn.close()
-            return _home_response(request, recipes, "Select at least one recipe or add one below.")
+        return await _home_error(request, "Select at least one recipe or add one below.")
     form = await request.form()
-    portion_qs = []
-    for rid in ids:
-        raw = form.get(f"portion_{rid}")
-        if raw is not None and str(raw).strip():
-            try:
-                p = max(1, int(float(str(raw).strip())))
-                portion_qs.append(f"portion_{rid}={p}")
-            except (ValueError, TypeError):
-                pass
-    query = "&".join([f"ids={','.join(map(str, ids))}"] + portion_qs)
+    portions = _parse_portions(form, ids)
+    params = [("ids", ",".join(map(str, ids)))]
+    params += [(f"portion_{rid}", portions[rid]) for rid in ids if rid in portions]
+    query = urlencode(params, safe=",")
     return RedirectResponse(url=f"/list/checklist?{query}", status_code=303)
 
 
+async def _checklist_recipes(request: Request, ids: str) -> dict[int, Recipe]:
+    """Recipes for ids=1,2,3 with portion_<id> query overrides applied (missing ids are skipped)."""
+    recipe_ids = _parse_ids(ids)
+    if not recipe_ids:
+        return {}
+    portions_override = _parse_portions(request.query_params, recipe_ids)
+    by_id = await asyncio.to_thread(_load_recipes_by_id, recipe_ids)
+    for rid, r in by_id.items():
+        if rid in portions_override:
+            r.portions = portions_override[rid]
+    return by_id
+
+
+async def _checklist_items(recipes: list[Recipe]) -> list[dict]:
+    """Merged, LLM-normalized checklist rows (the slow part of the checklist)."""
+    flat = flat_ingredients(recipes)
+    canonical_list = await normalize_ingredients_with_llm(flat)
+    return merge_flat_ingredients(flat, canonical_list)
+
+
 @app.get("/list/checklist", response_class=HTMLResponse)
-async def checklist_page(request: Request, ids: str = ""):
+async def checklist_page(request: Request, ids: str = "", inline: bool = False):
     """
     Step 2 & 3: Aggregated ingredient checklist.
     Default: pantry items unchecked (won't order), weekly items checked (will order).
     User marks pantry items they need to restock.
     Portions per recipe: use query portion_1=4, portion_2=6 etc.; else recipe default.
+    The page is returned right away and loads the items from /list/checklist/items, so the LLM
+    normalization doesn't hold up the first paint; inline=1 renders them in place (no-JS fallback).
     """
-    recipe_ids = [int(x.strip()) for x in ids.split(",") if x.strip()]
-    if not recipe_ids:
+    if not ids.strip():
         return RedirectResponse(url="/", status_code=302)
-    portions_override = {}
-    for rid in recipe_ids:
-        raw = request.query_params.get(f"portion_{rid}")
-        if raw is not None and str(raw).strip():
-            try:
-                portions_override[rid] = max(1, int(float(str(raw).strip())))
-            except (ValueError, TypeError):
-                pass
-    conn = get_connection()
-    try:
-        recipes = []
-        for rid in recipe_ids:
-            r = recipe_from_row(conn, rid)
-            if r:
-                if rid in portions_override:
-                    r.portions = portions_override[rid]
-                recipes.append(r)
-    finally:
-        conn.close()
+    by_id = await _checklist_recipes(request, ids)
+    recipes = list(by_id.values())
     if not recipes:
         return RedirectResponse(url="/list", status_code=302)
-    flat = flat_ingredients(recipes)
-    canonical_list = await normalize_ingredients_with_llm(flat)
-    ingredients_display = merge_flat_ingredients(flat, canonical_list)
-    recipe_portions = [(recipe_ids[i], int(recipes[i].portions)) for i in range(len(recipe_ids))]
+    query = request.url.query
+    ingredients_display, load_error = None, False
+    if inline:
+        try:
+            ingredients_display = await _checklist_items(recipes)
+        except Exception:
+            logger.exception("Could not build checklist items")
+            load_error = True
     return templates.TemplateResponse(
         "checklist.html",
         {
             "request": request,
-            "recipe_ids": recipe_ids,
+            "recipe_ids": list(by_id),
             "recipes": recipes,
-            "recipe_portions": recipe_portions,
+            "recipe_portions": [(rid, int(r.portions)) for rid, r in by_id.items()],
             "ingredients_display": ingredients_display,
+            "load_error": load_error,
+            "items_url": f"/list/checklist/items?{query}",
+            "inline_url": f"/list/checklist?{query}&inline=1",
+            "retry_url": f"/list/checklist?{query}",  # this same page: retries the way it was loaded
         },
     )
 
 
-@app.get("/api/grocery-list")
+@app.get("/list/checklist/items", response_class=HTMLResponse)
+async def checklist_items(request: Request, ids: str = ""):
+    """
+    Checklist rows as an HTML fragment; fetched by the checklist page (same query as /list/checklist).
+    503 if they can't be built; the page then shows an error with a retry link.
+    """
+    recipes = list((await _checklist_recipes(request, ids)).values())
+    try:
+        ingredients_display = await _checklist_items(recipes) if recipes else []
+    except Exception:
+        logger.exception("Could not build checklist items")
+        return HTMLResponse("Could not load the ingredient list.", status_code=503)
+    return templates.TemplateResponse(
+        "checklist_items.html",
+        {"request": request, "ingredients_display": ingredients_display},
+    )
+
+
+@app.get("/api/grocery-list", response_class=JSONResponse)
 async def api_grocery_list(
     request: Request,
     ids: str = "",
@@ -205,19 +370,10 @@ async def api_grocery_list(
     JSON output for the jumbo agent. Same format as get_grocery_list().
     Query: ids=1,2,3 & portion_1=4 & portion_2=6 (optional) & selected=0,1,3 (optional, indices to include).
     """
-    from grocery_agent.grocery_list import get_grocery_list
-
-    recipe_ids = [int(x.strip()) for x in ids.split(",") if x.strip()]
+    recipe_ids = _parse_ids(ids)
     if not recipe_ids:
-        return {"items": []}
-    portions_override = {}
-    for rid in recipe_ids:
-        raw = request.query_params.get(f"portion_{rid}")
-        if raw is not None and str(raw).strip():
-            try:
-                portions_override[rid] = max(1, int(float(str(raw).strip())))
-            except (ValueError, TypeError):
-                pass
+        return _json_response({"items": []})
+    portions_override = _parse_portions(request.query_params, recipe_ids)
     selected_indices = None
     if selected.strip():
         try:
@@ -225,7 +381,7 @@ async def api_grocery_list(
         except ValueError:
             pass
     items = await get_grocery_list(recipe_ids, portions_override or None, selected_indices)
-    return {"items": items}
+    return _json_response({"items": items})
 
 
 @app.post("/list/confirm", response_class=HTMLResponse)
@@ -234,25 +390,15 @@ async def list_confirm(request: Request, recipe_ids: str = Form("")):
     User confirmed. Build grocery list, write to data/grocery_list.json, start jumbo bot.
     """
     form = await request.form()
-    ids_str = (recipe_ids or "").strip()
-    recipe_id_list = [int(x.strip()) for x in ids_str.split(",") if x.strip()]
+    recipe_id_list = _parse_ids(recipe_ids or "")
     # Only checked checkboxes are submitted; unchecked ones are omitted from the form.
     raw = form.getlist("item_index")
     selected_indices = [int(x) for x in raw if x is not None and str(x).strip().isdigit()]
-    portions_override = {}
-    for rid in recipe_id_list:
-        val = form.get(f"portion_{rid}")
-        if val is not None and str(val).strip():
-            try:
-                portions_override[rid] = max(1, int(float(str(val).strip())))
-            except (ValueError, TypeError):
-                pass
-    portions_qs = "&".join(
-        f"portion_{rid}={form.get(f'portion_{rid}')}" for rid in recipe_id_list if form.get(f"portion_{rid}") is not None
+    portions_override = _parse_portions(form, recipe_id_list)
+    portions_qs = urlencode(
+        [(k, form[k]) for k in (f"portion_{rid}" for rid in recipe_id_list) if k in form]
     )
 
-    from grocery_agent.grocery_list import get_grocery_list, write_grocery_list
-
     # Recipe items: only those whose checkbox was checked (selected_indices).
     items = await get_grocery_list(recipe_id_list, portions_override or None, selected_indices)
     # Append manual extra items from the textarea (one per line).
@@ -271,10 +417,13 @@ async def list_confirm(request: Request, recipe_ids: str = Form("")):
             })
     write_grocery_list(items)
 
-    project_root = Path(__file__).resolve().parent.parent
-    subprocess.Popen(
-        [sys.executable, "-m", "grocery_agent.jumbo"],
-        cwd=str(project_root),
+    # fork/exec in a worker thread so the event loop isn't blocked. Plain Popen rather than
+    # asyncio.create_subprocess_exec: asyncio kills still-running children when the loop shuts down
+    # (e.g. a --reload restart), and the bot must outlive the request and the server.
+    await asyncio.to_thread(
+        subprocess.Popen,
+        _JUMBO_CMD,
+        cwd=PROJECT_ROOT,
         stdin=subprocess.DEVNULL,
     )
 
@@ -298,35 +447,31 @@ async def ingest(
     url: str | None = Form(None),
 ):
     """Add a new recipe (URL or text). Redirect to home with new recipe selected."""
-    conn = get_connection()
+    image_task = None
     try:
-        recipes = list_recipes(conn)
-    finally:
-        conn.close()
-    if url and url.strip():
+        if url and url.strip():
+            image_task = _start_image_fetch(url.strip())
+            try:
+                recipe_text = await fetch_recipe_text(url.strip())
+            except httpx.HTTPStatusError as e:
+                return await _home_error(request, f"Could not fetch URL: {e.response.status_code}. Try pasting the recipe text instead.")
+            except httpx.RequestError as e:
+                return await _home_error(request, f"Could not fetch URL: {e!s}. Try pasting the recipe text instead.")
+        elif text and text.strip():
+            recipe_text = text.strip()
+        else:
+            return await _home_error(request, "Paste recipe text or a recipe URL.")
         try:
-            recipe_text = await fetch_recipe_text(url.strip())
-        except httpx.HTTPStatusError as e:
-            return _home_response(request, recipes, f"Could not fetch URL: {e.response.status_code}. Try pasting the recipe text instead.")
-        except httpx.RequestError as e:
-            return _home_response(request, recipes, f"Could not fetch URL: {e!s}. Try pasting the recipe text instead.")
-    elif text and text.strip():
-        recipe_text = text.strip()
-    else:
-        return _home_response(request, recipes, "Paste recipe text or a recipe URL.")
-    try:
-        recipe = await parse_recipe(recipe_text)
-    except ValueError as e:
-        return _home_response(request, recipes, str(e))
-    if url and url.strip():
-        recipe.source_url = url.strip()
-        recipe.image_url = await fetch_recipe_image_url(url.strip())
-    conn = get_connection()
-    try:
-        recipe_id = insert_recipe(conn, recipe)
-        conn.commit()
+            recipe = await parse_recipe(recipe_text)
+        except ValueError as e:
+            return await _home_error(request, str(e))
+        if image_task is not None:
+            recipe.source_url = url.strip()
+            recipe.image_url = await _image_url_or_none(image_task)
     finally:
-        conn.close()
+        if image_task is not None:
+            image_task.cancel()  # no-op once awaited; stops the lookup on any early exit or error
+    recipe_id = await asyncio.to_thread(_save_new_recipe, recipe)
     return RedirectResponse(url=f"/?new_id={recipe_id}", status_code=303)
 
 
@@ -336,6 +481,18 @@ def run() -> None:
     uvicorn.run("grocery_agent.web:app", host="0.0.0.0", port=8000, reload=True)
 
 
+def run_prod() -> None:
+    """
+    Run the web app without the reload watcher (uv run start-prod).
+    uvicorn[standard] picks uvloop + httptools when installed. One worker on purpose: the recipe
+    view cache and LLM request batching are per process.
+    """
+    import uvicorn
+    # Templates don't change under a running prod server: skip the per-render mtime check
+    templates.env.auto_reload = False
+    uvicorn.run("grocery_agent.web:app", host="0.0.0.0", port=8000, reload=False, loop="auto", http="auto")
+
+
 def _format_scaled_amount(quantity_per_portion: float | None, unit: str | None, servings: int) -> str:
     """Format ingredient amount for display: scaled number + unit, or just unit (e.g. 'to taste')."""
     if quantity_per_portion is None:
@@ -349,36 +506,61 @@ def _format_scaled_amount(quantity_per_portion: float | None, unit: str | None,
     return f"{num_str} {unit or ''}".strip()
 
 
-@app.get("/recipe/{recipe_id}", response_class=HTMLResponse)
-async def show_recipe(request: Request, recipe_id: int, servings: int = 4):
-    """Show a saved recipe scaled to the given number of servings (default 4)."""
-    if servings < 1:
-        servings = 4
+def _build_recipe_view(recipe_id: int, servings: int) -> tuple[Recipe, list[dict]]:
+    """Load a recipe and its scaled ingredient display rows. Raises KeyError if it doesn't exist."""
     conn = get_connection()
     try:
         recipe = recipe_from_row(conn, recipe_id)
     finally:
         conn.close()
     if not recipe:
-        conn = get_connection()
-        try:
-            recipes = list_recipes(conn)
-        finally:
-            conn.close()
-        return _home_response(request, recipes, f"Recipe {recipe_id} not found.")
+        raise KeyError(recipe_id)
     # Precompute display string for each ingredient (scaled amount + unit, or just unit)
     ingredients_display = [
         {
             "name": ing.name,
             "category": ing.category,
             "amount_str": _format_scaled_amount(ing.quantity_per_portion, ing.unit, servings),
-            "optional": getattr(ing, "optional", False),
-            "pantry_item": getattr(ing, "pantry_item", False),
-            "form": getattr(ing, "form", None),
+            "optional": ing.optional,
+            "pantry_item": ing.pantry_item,
+            "form": ing.form,
         }
         for ing in recipe.ingredients
     ]
-    return templates.TemplateResponse(
+    return recipe, ingredients_display
+
+
+# Recipe page data for common servings. Only hits are cached (KeyError is not), so recipes added later
+# show up; edit and delete clear it. Cached values are shared between requests: treat as read-only.
+@lru_cache(maxsize=256)
+def _cached_recipe_view(recipe_id: int, servings: int, data_version: int) -> tuple[Recipe, list[dict]]:
+    """
+    _build_recipe_view keyed by the _data_version read before building: a build that raced a write
+    can only be stored under the old version, so it is never served once _recipes_changed() ran.
+    """
+    return _build_recipe_view(recipe_id, servings)
+
+
+_CACHED_SERVINGS = range(1, 21)
+
+
+@app.get("/recipe/{recipe_id}", response_class=HTMLResponse)
+def show_recipe(request: Request, recipe_id: int, servings: int = 4):
+    """Show a saved recipe scaled to the given number of servings (default 4)."""
+    if servings < 1:
+        servings = 4
+    version = _data_version  # one read: the ETag and the cache key must use the same version
+    etag, fresh = _page_etag(request, version)
+    if fresh:
+        return _with_etag(Response(status_code=304), etag)
+    try:
+        if servings in _CACHED_SERVINGS:
+            recipe, ingredients_display = _cached_recipe_view(recipe_id, servings, version)
+        else:
+            recipe, ingredients_display = _build_recipe_view(recipe_id, servings)
+    except KeyError:
+        return _home_response(request, _load_recipes(), f"Recipe {recipe_id} not found.")
+    response = templates.TemplateResponse(
         "recipe.html",
         {
             "request": request,
@@ -388,10 +570,11 @@ async def show_recipe(request: Request, recipe_id: int, servings: int = 4):
             "ingredients_display": ingredients_display,
         },
     )
+    return _with_etag(response, etag)
 
 
 @app.get("/recipe/{recipe_id}/edit", response_class=HTMLResponse)
-async def recipe_edit_page(request: Request, recipe_id: int):
+def recipe_edit_page(request: Request, recipe_id: int):
     """Minimal edit form: name, portions, instructions, source URL."""
     conn = get_connection()
     try:
@@ -399,12 +582,7 @@ async def recipe_edit_page(request: Request, recipe_id: int):
     finally:
         conn.close()
     if not recipe:
-        conn = get_connection()
-        try:
-            recipes = list_recipes(conn)
-        finally:
-            conn.close()
-        return _home_response(request, recipes, f"Recipe {recipe_id} not found.")
+        return _home_response(request, _load_recipes(), f"Recipe {recipe_id} not found.")
     ingredient_count = len(recipe.ingredients) + 1  # +1 for empty "add" row
     return templates.TemplateResponse(
         "recipe_edit.html",
@@ -412,6 +590,26 @@ async def recipe_edit_page(request: Request, recipe_id: int):
     )
 
 
+def _save_recipe_edit(
+    recipe_id: int,
+    name: str,
+    portions: float,
+    instructions: str,
+    source_url: str | None,
+    ingredients: list[dict],
+) -> bool:
+    """Update the recipe row and replace its ingredients in one commit; False if it doesn't exist."""
+    conn = get_connection()
+    try:
+        ok = update_recipe(conn, recipe_id, name, portions, instructions, source_url)
+        if ok:
+            replace_recipe_ingredients(conn, recipe_id, ingredients)
+        conn.commit()
+    finally:
+        conn.close()
+    return ok
+
+
 @app.post("/recipe/{recipe_id}/edit", response_class=HTMLResponse)
 async def recipe_edit_submit(
     request: Request,
@@ -452,26 +650,15 @@ async def recipe_edit_submit(
             "pantry_item": pantry,
             "form": str(form_val).strip() or "fresh",
         })
-    conn = get_connection()
-    try:
-        ok = update_recipe(conn, recipe_id, name, portions, instructions, source_url)
-        if ok:
-            replace_recipe_ingredients(conn, recipe_id, ingredients)
-        conn.commit()
-    finally:
-        conn.close()
+    ok = await asyncio.to_thread(_save_recipe_edit, recipe_id, name, portions, instructions, source_url, ingredients)
+    _recipes_changed()
     if not ok:
-        conn = get_connection()
-        try:
-            recipes = list_recipes(conn)
-        finally:
-            conn.close()
-        return _home_response(request, recipes, f"Recipe {recipe_id} not found.")
+        return await _home_error(request, f"Recipe {recipe_id} not found.")
     return RedirectResponse(url="/", status_code=303)
 
 
 @app.post("/recipe/{recipe_id}/delete", response_class=HTMLResponse)
-async def recipe_delete(request: Request, recipe_id: int):
+def recipe_delete(request: Request, recipe_id: int):
     """Delete a recipe and redirect home."""
     conn = get_connection()
     try:
@@ -479,11 +666,7 @@ async def recipe_delete(request: Request, recipe_id: int):
         conn.commit()
     finally:
         conn.close()
+    _recipes_changed()
     if not ok:
-        conn = get_connection()
-        try:
-            recipes = list_recipes(conn)
-        finally:
-            conn.close()
-        return _home_response(request, recipes, f"Recipe {recipe_id} not found.")
+        return _home_response(request, _load_recipes(), f"Recipe {recipe_id} not found.")
     return RedirectResponse(url="/", status_code=303)
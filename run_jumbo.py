@@ -7,27 +7,7 @@ Run the Jumbo browser agent. Delegates to grocery_agent.jumbo.
 Grocery list: data/grocery_list.json (written by web app on Confirm).
 LLM: BROWSER_USE_API_KEY or GOOGLE_API_KEY in .env.
 """
-import asyncio
-import logging
-import sys
-
-from dotenv import load_dotenv
-
-from grocery_agent.jumbo import run
-from grocery_agent.llm import get_browser_use_llm
-
-load_dotenv()
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    datefmt="%H:%M:%S",
-)
+from grocery_agent.jumbo.__main__ import main
 
 if __name__ == "__main__":
-    try:
-        llm = get_browser_use_llm()
-    except ValueError as e:
-        print(e, file=sys.stderr)
-        sys.exit(1)
-    asyncio.run(run(llm))
+    main()